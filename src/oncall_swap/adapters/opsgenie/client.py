@@ -6,6 +6,7 @@ from typing import List
 
 import httpx
 
+from oncall_swap.adapters.opsgenie.threaded import ThreadedOpsgenieMixin
 from oncall_swap.domain.models import Participant, TimeWindow
 from oncall_swap.ports.directory import ParticipantDirectoryPort
 from oncall_swap.ports.opsgenie import OnCallAssignment, OpsgenieOverridePort, OpsgenieSchedulePort
@@ -13,7 +14,7 @@ from oncall_swap.ports.opsgenie import OnCallAssignment, OpsgenieOverridePort, O
 logger = logging.getLogger(__name__)
 
 
-class OpsgenieClient(OpsgenieSchedulePort, OpsgenieOverridePort):
+class OpsgenieClient(ThreadedOpsgenieMixin, OpsgenieSchedulePort, OpsgenieOverridePort):
     """HTTP client for Opsgenie schedule and override APIs."""
 
     def __init__(
@@ -79,11 +80,6 @@ class OpsgenieClient(OpsgenieSchedulePort, OpsgenieOverridePort):
             logger.error(f"Unexpected error calling Opsgenie API: {e}", exc_info=True)
             raise ConnectionError(f"Unexpected error calling Opsgenie API: {e}") from e
 
-    def apply_overrides(self, schedule_id: str, assignments: List[OnCallAssignment]) -> None:
-        """Apply multiple overrides to a schedule."""
-        for assignment in assignments:
-            self.apply_override(schedule_id, assignment.participant, assignment.window)
-
     def apply_override(self, schedule_id: str, participant: Participant, window: TimeWindow) -> None:
         try:
             payload = {
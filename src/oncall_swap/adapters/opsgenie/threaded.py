@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from oncall_swap.ports.opsgenie import OnCallAssignment
+
+# Upper bound on concurrent Opsgenie requests issued by the fan-out helpers below
+_MAX_WORKERS = 8
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool, created on first use; its idle workers are joined at interpreter exit."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="opsgenie")
+        return _executor
+
+
+class ThreadedOpsgenieMixin:
+    """Mixin for Opsgenie adapters that issues batched requests concurrently on a shared thread pool.
+
+    For adapters without bulk APIs, where each ``list_oncall`` or
+    ``apply_override`` is its own round trip: wall time follows the slowest
+    request rather than their sum. List it before the port classes so its
+    methods take precedence; single-item batches fall through to the ports'
+    sequential defaults. For overrides, the first failure is re-raised once
+    every request has completed.
+    """
+
+    def list_oncall_many(
+        self, schedule_ids: Sequence[str], start: datetime, end: datetime
+    ) -> Dict[str, List[OnCallAssignment]]:
+        if len(schedule_ids) <= 1:
+            return super().list_oncall_many(schedule_ids, start, end)
+        executor = _shared_executor()
+        futures = {
+            schedule_id: executor.submit(self.list_oncall, schedule_id, start, end)
+            for schedule_id in schedule_ids
+        }
+        return {schedule_id: future.result() for schedule_id, future in futures.items()}
+
+    def bulk_apply_overrides(self, schedule_id: str, assignments: List[OnCallAssignment]) -> None:
+        if len(assignments) <= 1:
+            super().bulk_apply_overrides(schedule_id, assignments)
+            return
+        executor = _shared_executor()
+        futures = [
+            executor.submit(self.apply_override, schedule_id, assignment.participant, assignment.window)
+            for assignment in assignments
+        ]
+        errors = [error for error in (future.exception() for future in futures) if error is not None]
+        if errors:
+            raise errors[0]
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import logging
+from collections import defaultdict
 from datetime import date, datetime, timedelta, time, timezone
-from typing import Dict, List, Optional, Tuple
+from operator import attrgetter
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from slack_bolt import App
+from slack_sdk.errors import SlackApiError
 
 from oncall_swap.application.commands import AcceptCoverCommand, CreateOfferCommand, TimeWindowDTO
 from oncall_swap.application.services import SwapNegotiationService
@@ -13,6 +18,21 @@ from oncall_swap.domain.models import Participant, SwapOffer, TimeWindow
 from oncall_swap.ports.opsgenie import OnCallAssignment
 from oncall_swap.ports.slack import SlackNotificationPort
 
+logger = logging.getLogger(__name__)
+
+# How long a participant's last fetched on-call windows may stand in for Opsgenie when it is unreachable.
+_WINDOWS_CACHE_TTL_SECONDS = 600.0
+
+# Slack API errors on Slack's side, which a second attempt may not hit. Permanent errors
+# (invalid_auth, channel_not_found, expired_trigger_id, ...) fail the same way again, and
+# ratelimited is left to the client's rate limit handling rather than retried immediately.
+_TRANSIENT_SLACK_ERRORS = frozenset({"internal_error", "fatal_error", "service_unavailable", "request_timeout"})
+
+
+def _is_transient(exc: SlackApiError) -> bool:
+    response = exc.response
+    return response.get("error") in _TRANSIENT_SLACK_ERRORS or getattr(response, "status_code", 0) >= 500
+
 
 def _date_to_str(d: date) -> str:
     return d.isoformat()
@@ -46,6 +66,31 @@ def _date_range_to_time_windows(start_date: date, end_date: date) -> List[TimeWi
     return windows
 
 
+def _let_date_options(windows: List[TimeWindow]) -> List[dict]:
+    """Build one select option per on-call date, keeping the first window seen for each date."""
+    date_options: Dict[date, TimeWindow] = {}
+    for window in windows[:25]:
+        date_options.setdefault(window.start.date(), window)
+    return [
+        {
+            "text": {"type": "plain_text", "text": _date_to_str(d)},
+            "value": json.dumps(_window_to_value(w)),
+        }
+        for d, w in sorted(date_options.items())
+    ]
+
+
+def _parse_existing_windows(existing_windows_data: List[list]) -> List[Tuple[date, Optional[date]]]:
+    """Parse the ``[start, end]`` date pairs carried between swap offer modal renders."""
+    existing_windows = []
+    for window_data in existing_windows_data:
+        if len(window_data) >= 1 and window_data[0]:
+            start_date = date.fromisoformat(window_data[0])
+            end_date = date.fromisoformat(window_data[1]) if len(window_data) > 1 and window_data[1] else None
+            existing_windows.append((start_date, end_date))
+    return existing_windows
+
+
 class SlackBotAdapter(SlackNotificationPort):
     """Slack Bolt adapter for on-call swap workflow."""
 
@@ -62,6 +107,8 @@ class SlackBotAdapter(SlackNotificationPort):
         self.schedule_id = schedule_id
         self._offer_threads: Dict[UUID, Tuple[str, str]] = {}
         self._posted_needs: Dict[UUID, set] = {}  # Track which needs have been posted
+        self._last_windows: Dict[Tuple[str, str], Tuple[float, List[TimeWindow]]] = {}  # Last good on-call windows per (schedule, email)
+        self._reactions_sent: Dict[UUID, set] = defaultdict(set)  # Emoji already added to each offer thread
         # Ensure the service outputs through this adapter.
         self.negotiation_service.slack_notifications = self
         self._register_handlers()
@@ -70,17 +117,17 @@ class SlackBotAdapter(SlackNotificationPort):
 
     def announce_offer(self, offer: SwapOffer) -> None:
         """Post initial swap offer and create thread."""
-        let_date = offer.let_window.start.date()
+        let_date = offer.let_window.start_date
         
         # Group search windows by date ranges
         search_ranges = []
         current_start = None
         current_end = None
         
-        sorted_windows = sorted(offer.search_windows, key=lambda w: w.start.date())
+        sorted_windows = sorted(offer.search_windows, key=attrgetter("start_date"))
         for window in sorted_windows:
-            window_start = window.start.date()
-            window_end = window.end.date()
+            window_start = window.start_date
+            window_end = window.end_date
             
             if current_start is None:
                 current_start = window_start
@@ -143,6 +190,7 @@ class SlackBotAdapter(SlackNotificationPort):
             },
         ]
 
+        # Not retried: the message may have been posted even when the call reports an error
         response = self.app.client.chat_postMessage(
             channel=self.announcement_channel,
             text=f"🌀 New on-call swap offer from {offer.requester.email}",
@@ -264,6 +312,7 @@ class SlackBotAdapter(SlackNotificationPort):
 
         # Track which needs we've already posted
         posted = self._posted_needs.setdefault(offer.id, set())
+        offer_id_str = str(offer.id)
 
         # Post a new message for each ring swap need that hasn't been posted yet
         for need in offer.outstanding_needs:
@@ -296,7 +345,7 @@ class SlackBotAdapter(SlackNotificationPort):
                             "text": {"type": "plain_text", "text": "Respond"},
                             "value": json.dumps(
                                 {
-                                    "offer_id": str(offer.id),
+                                    "offer_id": offer_id_str,
                                     "covers_window": _window_to_value(need.window),
                                 }
                             ),
@@ -324,30 +373,16 @@ class SlackBotAdapter(SlackNotificationPort):
                     return
 
                 # Get user's upcoming on-call windows to populate let date options
-                windows = self.negotiation_service.get_upcoming_windows(
-                    schedule_id=self.schedule_id,
-                    participant_email=email,
-                )
+                windows = self._upcoming_windows(email)
                 if not windows:
                     respond("No upcoming on-call windows found for you in Opsgenie.")
                     return
 
                 # Create date options from windows
-                date_options = {}
-                for window in windows[:25]:
-                    window_date = window.start.date()
-                    if window_date not in date_options:
-                        date_options[window_date] = window
-
-                options = [
-                    {
-                        "text": {"type": "plain_text", "text": _date_to_str(d)},
-                        "value": json.dumps(_window_to_value(w)),
-                    }
-                    for d, w in sorted(date_options.items())
-                ]
+                options = _let_date_options(windows)
 
-                self.app.client.views_open(
+                self._call_with_retry(
+                    self.app.client.views_open,
                     trigger_id=body["trigger_id"],
                     view=_build_swap_offer_modal(
                         let_date_options=options,
@@ -376,12 +411,7 @@ class SlackBotAdapter(SlackNotificationPort):
                     metadata = metadata_str
                 
                 # Parse existing windows
-                existing_windows = []
-                for window_data in existing_windows_data:
-                    if len(window_data) >= 1 and window_data[0]:
-                        start_date = date.fromisoformat(window_data[0])
-                        end_date = date.fromisoformat(window_data[1]) if len(window_data) > 1 and window_data[1] else None
-                        existing_windows.append((start_date, end_date))
+                existing_windows = _parse_existing_windows(existing_windows_data)
                 
                 # Get current state to extract the current window being entered
                 view_state = body.get("view", {}).get("state", {}).get("values", {})
@@ -427,23 +457,8 @@ class SlackBotAdapter(SlackNotificationPort):
                     logger.error("No email found for user %s", user_id)
                     return
                 
-                windows = self.negotiation_service.get_upcoming_windows(
-                    schedule_id=self.schedule_id,
-                    participant_email=email,
-                )
-                date_options = {}
-                for window in windows[:25]:
-                    window_date = window.start.date()
-                    if window_date not in date_options:
-                        date_options[window_date] = window
-                
-                options = [
-                    {
-                        "text": {"type": "plain_text", "text": _date_to_str(d)},
-                        "value": json.dumps(_window_to_value(w)),
-                    }
-                    for d, w in sorted(date_options.items())
-                ]
+                windows = self._upcoming_windows(email)
+                options = _let_date_options(windows)
                 
                 # Get selected let window from current view
                 let_window_block = view_state.get("let_window_block", {}).get("let_window", {})
@@ -502,13 +517,7 @@ class SlackBotAdapter(SlackNotificationPort):
                 let_window = _parse_window_value(let_selection["value"])
 
                 # Parse existing windows from metadata
-                existing_windows_data = private_metadata.get("existing_windows", [])
-                existing_windows = []
-                for window_data in existing_windows_data:
-                    if len(window_data) >= 1 and window_data[0]:
-                        start_date = date.fromisoformat(window_data[0])
-                        end_date = date.fromisoformat(window_data[1]) if len(window_data) > 1 and window_data[1] else None
-                        existing_windows.append((start_date, end_date))
+                existing_windows = _parse_existing_windows(private_metadata.get("existing_windows", []))
 
                 # Collect windows from date pickers
                 search_windows = []
@@ -666,10 +675,15 @@ class SlackBotAdapter(SlackNotificationPort):
                     return
 
                 # Create options with direct/ring labels
-                search_dates = {w.start.date() for w in offer.search_windows}
+                search_dates = offer.search_window_dates
                 options = []
+                seen_dates = set()
                 for window in user_windows[:25]:
                     window_date = window.start.date()
+                    # Opsgenie may return several periods for the same day; offer each date once.
+                    if window_date in seen_dates:
+                        continue
+                    seen_dates.add(window_date)
                     is_direct = window_date in search_dates
                     label = "(direct swap)" if is_direct else "(ring swap)"
                     options.append(
@@ -724,16 +738,14 @@ class SlackBotAdapter(SlackNotificationPort):
                     )
                     return
 
-                covers_window = _parse_window_value(json.dumps(metadata["covers_window"]))
-                need_window = _parse_window_value(selected_option["value"])
-
-                command = AcceptCoverCommand(
-                    offer_id=offer_id,
-                    participant_email=email,
-                    covers_window=TimeWindowDTO(start=covers_window.start, end=covers_window.end),
-                    needs_windows=[
-                        TimeWindowDTO(start=need_window.start, end=need_window.end),
-                    ],
+                # Validate the raw payload in one pass; pydantic parses the ISO strings.
+                command = AcceptCoverCommand.model_validate(
+                    {
+                        "offer_id": offer_id,
+                        "participant_email": email,
+                        "covers_window": metadata["covers_window"],
+                        "needs_windows": [json.loads(selected_option["value"])],
+                    }
                 )
                 result = self.negotiation_service.accept_cover(command)
 
@@ -767,7 +779,38 @@ class SlackBotAdapter(SlackNotificationPort):
             )
             self._offer_threads[offer_id] = (response["channel"], response["ts"])
 
+    def _call_with_retry(self, method: Callable[..., Any], **kwargs: Any) -> Any:
+        """Call a Slack Web API method, retrying once on a transient Slack API error."""
+        try:
+            return method(**kwargs)
+        except SlackApiError as exc:
+            if not _is_transient(exc):
+                raise
+            logger.warning("Slack API call failed, retrying once: %s", exc)
+            return method(**kwargs)
+
+    def _upcoming_windows(self, email: str) -> List[TimeWindow]:
+        """Fetch ``email``'s upcoming on-call windows, falling back to recent ones if Opsgenie is unreachable."""
+        cache_key = (self.schedule_id, email)
+        try:
+            windows = self.negotiation_service.get_upcoming_windows(
+                schedule_id=self.schedule_id,
+                participant_email=email,
+            )
+        except ConnectionError:
+            cached = self._last_windows.get(cache_key)
+            if cached is None or monotonic() - cached[0] > _WINDOWS_CACHE_TTL_SECONDS:
+                raise
+            logger.warning("Opsgenie unavailable; offering cached on-call windows for %s", email)
+            return cached[1]
+        self._last_windows[cache_key] = (monotonic(), windows)
+        return windows
+
     def _add_reaction(self, offer_id: UUID, emoji: str) -> None:
+        # Slack may redeliver events; skip the round-trip if we already reacted.
+        # .get() rather than indexing: a lookup must not insert an empty set into the defaultdict
+        if emoji in self._reactions_sent.get(offer_id, ()):
+            return
         channel_ts = self._offer_threads.get(offer_id)
         if not channel_ts:
             print(f"No thread found for offer {offer_id}")
@@ -779,12 +822,37 @@ class SlackBotAdapter(SlackNotificationPort):
                 name=emoji,
                 timestamp=thread_ts,
             )
-            if not result.get("ok"):
+            if result.get("ok"):
+                self._reactions_sent[offer_id].add(emoji)
+            else:
                 print(f"Failed to add reaction to thread: {result.get('error')}")
+        except SlackApiError as e:
+            if e.response.get("error") == "already_reacted":
+                self._reactions_sent[offer_id].add(emoji)
+            else:
+                print(f"Exception adding reaction to thread: {e}")
         except Exception as e:
             print(f"Exception adding reaction to thread: {e}")
 
 
+# Static Block Kit fragments shared by every modal render. Slack only reads these,
+# so they are built once at import; callers must not mutate them.
+_MODAL_CLOSE = {"type": "plain_text", "text": "Cancel"}
+_OFFER_MODAL_TITLE = {"type": "plain_text", "text": "Create Swap Offer"}
+_OFFER_MODAL_SUBMIT = {"type": "plain_text", "text": "Create"}
+_OFFER_MODAL_SUBMIT_ADD = {"type": "plain_text", "text": "Add & Create"}
+_ADD_WINDOW_BUTTON_TEXT = {"type": "plain_text", "text": "➕ Add another window"}
+_SEARCH_WINDOWS_HEADER_BLOCK = {
+    "type": "section",
+    "text": {
+        "type": "mrkdwn",
+        "text": "*Search windows* (preferred dates for coverage)\nYou can specify single dates or date ranges.",
+    },
+}
+_RESPONSE_MODAL_TITLE = {"type": "plain_text", "text": "Respond to Swap"}
+_RESPONSE_MODAL_SUBMIT = {"type": "plain_text", "text": "Submit"}
+
+
 def _build_swap_offer_modal(let_date_options: List[dict], metadata: str, existing_windows: Optional[List[Tuple[Optional[date], Optional[date]]]] = None) -> dict:
     """Build the swap offer modal with date ranges or single dates.
     
@@ -806,13 +874,7 @@ def _build_swap_offer_modal(let_date_options: List[dict], metadata: str, existin
                 "options": let_date_options,
             },
         },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "*Search windows* (preferred dates for coverage)\nYou can specify single dates or date ranges.",
-            },
-        },
+        _SEARCH_WINDOWS_HEADER_BLOCK,
     ]
     
     # Add existing windows as read-only text
@@ -857,21 +919,24 @@ def _build_swap_offer_modal(let_date_options: List[dict], metadata: str, existin
         },
     ])
     
+    # The same carried-over state backs both the button value and the private metadata
+    carried_state = json.dumps({
+        "existing_windows": [
+            [w[0].isoformat(), w[1].isoformat() if w[1] else None]
+            for w in existing_windows
+        ],
+        "metadata": metadata,
+    })
+
     # Add button to add another window
     blocks.append({
         "type": "actions",
         "elements": [
             {
                 "type": "button",
-                "text": {"type": "plain_text", "text": "➕ Add another window"},
+                "text": _ADD_WINDOW_BUTTON_TEXT,
                 "action_id": "add_another_range",
-                "value": json.dumps({
-                    "existing_windows": [
-                        [w[0].isoformat(), w[1].isoformat() if w[1] else None]
-                        for w in existing_windows
-                    ],
-                    "metadata": metadata,
-                }),
+                "value": carried_state,
             }
         ],
     })
@@ -879,16 +944,10 @@ def _build_swap_offer_modal(let_date_options: List[dict], metadata: str, existin
     return {
         "type": "modal",
         "callback_id": "swap_offer_submit",
-        "private_metadata": json.dumps({
-            "existing_windows": [
-                [w[0].isoformat(), w[1].isoformat() if w[1] else None]
-                for w in existing_windows
-            ],
-            "metadata": metadata,
-        }),
-        "title": {"type": "plain_text", "text": "Create Swap Offer"},
-        "submit": {"type": "plain_text", "text": "Create" if not existing_windows else "Add & Create"},
-        "close": {"type": "plain_text", "text": "Cancel"},
+        "private_metadata": carried_state,
+        "title": _OFFER_MODAL_TITLE,
+        "submit": _OFFER_MODAL_SUBMIT_ADD if existing_windows else _OFFER_MODAL_SUBMIT,
+        "close": _MODAL_CLOSE,
         "blocks": blocks,
     }
 
@@ -908,9 +967,9 @@ def _build_response_modal(
         "type": "modal",
         "callback_id": "swap_response_submit",
         "private_metadata": json.dumps(metadata),
-        "title": {"type": "plain_text", "text": "Respond to Swap"},
-        "submit": {"type": "plain_text", "text": "Submit"},
-        "close": {"type": "plain_text", "text": "Cancel"},
+        "title": _RESPONSE_MODAL_TITLE,
+        "submit": _RESPONSE_MODAL_SUBMIT,
+        "close": _MODAL_CLOSE,
         "blocks": [
             {
                 "type": "section",
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from functools import partial
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import UUID
 
 from oncall_swap.application.commands import AcceptCoverCommand, CreateOfferCommand, TimeWindowDTO
@@ -30,6 +34,30 @@ class OfferNotActiveError(Exception):
     pass
 
 
+@dataclass
+class _PendingIO:
+    """Outbound calls accumulated while a use-case runs, flushed by ``SwapNegotiationService._outbox``."""
+
+    offers: Dict[UUID, SwapOffer] = field(default_factory=dict)
+    overrides: Dict[str, List[OnCallAssignment]] = field(default_factory=dict)
+    notifications: List[Callable[[], None]] = field(default_factory=list)
+    fulfilled: List[SwapOffer] = field(default_factory=list)
+
+    def save(self, offer: SwapOffer) -> None:
+        self.offers[offer.id] = offer
+
+    def fulfil(self, offer: SwapOffer) -> None:
+        """Save ``offer`` as fulfilled, closing it only once its overrides have been applied."""
+        self.save(offer)
+        self.fulfilled.append(offer)
+
+    def add_overrides(self, schedule_id: str, assignments: Iterable[OnCallAssignment]) -> None:
+        self.overrides.setdefault(schedule_id, []).extend(assignments)
+
+    def notify(self, send: Callable[..., None], *args: Any, **kwargs: Any) -> None:
+        self.notifications.append(partial(send, *args, **kwargs))
+
+
 class SwapNegotiationService:
     """Application service orchestrating the swap lifecycle."""
 
@@ -51,9 +79,10 @@ class SwapNegotiationService:
         self.logger = logging.getLogger(__name__)
 
     def create_offer(self, command: CreateOfferCommand, now: Optional[Instant] = None) -> SwapOffer:
+        notifications, _ = self._require_slack_ports()
         requester = self._ensure_participant(command.requester_email)
         let_window = self._to_window(command.let_window)
-        search_windows = [self._to_window(w) for w in command.search_windows]
+        search_windows = [TimeWindow(start=w.start, end=w.end) for w in command.search_windows]
 
         offer = SwapOffer.create(
             requester=requester,
@@ -62,16 +91,16 @@ class SwapNegotiationService:
             search_windows=search_windows,
             now=now,
         )
-        self.repository.add(offer)
-
-        notifications, _ = self._require_slack_ports()
-        notifications.announce_offer(offer)
+        with self._outbox() as outbox:
+            self.repository.add(offer)
+            outbox.notify(notifications.announce_offer, offer)
         return offer
 
     def accept_cover(self, command: AcceptCoverCommand):
         offer = self._get_offer(command.offer_id)
         if not offer.is_active():
             raise OfferNotActiveError(f"Offer {offer.id} is no longer active (status={offer.status}).")
+        notifications, _ = self._require_slack_ports()
 
         participant = self._ensure_participant(command.participant_email)
         covers_window = self._to_window(command.covers_window)
@@ -80,266 +109,273 @@ class SwapNegotiationService:
         if not needs_window:
             raise ValueError("Must specify a window to receive in return")
 
-        # Check if this is a direct swap (needs_window is in search_windows)
-        # Any direct swap closes the negotiation
-        search_window_dates = {w.start.date() for w in offer.search_windows}
-        is_direct = needs_window.start.date() in search_window_dates
-
-        if is_direct:
-            # Direct swap: close immediately and apply overrides
-            # Check if this covers the original let_window (by date overlap)
-            let_window_start_date = offer.let_window.start.date()
-            let_window_end_date = offer.let_window.end.date()
-            covers_window_start_date = covers_window.start.date()
-            covers_window_end_date = covers_window.end.date()
-            
-            covers_let_window = (
-                covers_window_start_date <= let_window_end_date
-                and let_window_start_date <= covers_window_end_date
-            )
-            
-            if covers_let_window:
-                # Direct swap covering the original let_window
-                # If someone already committed via ring swap, we should cancel that commitment
-                # and create a simple direct swap instead, since a direct swap takes precedence
-                # Check for any commitment covering let_window (could be from this participant or another)
-                # Use date overlap to find commitments
-                let_commitment = next(
-                    (c for c in offer.partial_commitments 
-                     if (c.window.start.date() <= let_window_end_date
-                         and let_window_start_date <= c.window.end.date())),
-                    None,
-                )
+        with self._outbox() as outbox:
+            # Resolve the calendar dates compared below once per call
+            let_window_start_date = offer.let_window.start_date
+            needs_window_start_date = needs_window.start_date
+            covers_let_window = covers_window.overlaps_by_date(offer.let_window)
+            requester_id = offer.requester.id
+            participant_id = participant.id
+
+            # Check if this is a direct swap (needs_window is in search_windows)
+            # Any direct swap closes the negotiation
+            is_direct = needs_window_start_date in offer.search_window_dates
+
+            if is_direct:
+                # Direct swap: close immediately and apply overrides
+                # Check if this covers the original let_window (by date overlap)
+                if covers_let_window:
+                    # Direct swap covering the original let_window
+                    # If someone already committed via ring swap, we should cancel that commitment
+                    # and create a simple direct swap instead, since a direct swap takes precedence
+                    # Check for any commitment covering let_window (could be from this participant or another)
+                    # Use date overlap to find commitments
+                    _, let_commitment = self._find_let_commitment(offer, ())
                 
-                if let_commitment:
-                    # Cancel the ring swap commitment - direct swap takes precedence
-                    # This could be the current participant's own commitment or someone else's
-                    commitment_participant = let_commitment.from_participant
+                    if let_commitment:
+                        # Cancel the ring swap commitment - direct swap takes precedence
+                        # This could be the current participant's own commitment or someone else's
+                        commitment_participant = let_commitment.from_participant
                     
-                    # Trace the entire ring swap chain and remove all related needs and commitments
-                    # Start with the commitment participant
-                    participants_to_clean = {commitment_participant.id}
-                    commitments_to_check = [let_commitment]
-                    checked_commitments = set()
+                        # Trace the entire ring swap chain and remove all related needs and commitments
+                        # Start with the commitment participant
+                        participants_to_clean = {commitment_participant.id}
+                        # A committer with no ring need of their own ends the chain right here
+                        has_ring_need = any(
+                            not n.created_by_offer for n in offer.needs_owned_by(commitment_participant.id)
+                        )
+                        commitments_to_check = deque([let_commitment] if has_ring_need else ())
                     
-                    # Recursively find all participants in the chain by following commitments
-                    while commitments_to_check:
-                        current_commit = commitments_to_check.pop(0)
-                        if id(current_commit) in checked_commitments:
-                            continue
-                        checked_commitments.add(id(current_commit))
+                        # Recursively find all participants in the chain by following commitments;
+                        # a commitment is only enqueued once its owner joins participants_to_clean
+                        while commitments_to_check:
+                            current_commit = commitments_to_check.popleft()
+                            cc_id = current_commit.from_participant.id
                         
-                        # Find what the commitment participant needs
-                        for need in offer.outstanding_needs:
-                            if (need.owner.id == current_commit.from_participant.id 
-                                and not need.created_by_offer):
+                            # Find what the commitment participant needs
+                            for need in offer.needs_owned_by(cc_id):
+                                if need.created_by_offer:
+                                    continue
                                 # Find who committed to cover this need
-                                for commit in offer.partial_commitments:
-                                    if (commit.window.start.date() <= need.window.end.date()
-                                        and need.window.start.date() <= commit.window.end.date()):
-                                        # This commitment covers the need
-                                        if commit.from_participant.id not in participants_to_clean:
-                                            participants_to_clean.add(commit.from_participant.id)
-                                            commitments_to_check.append(commit)
+                                for commit in offer.commitments_overlapping(need.window):
+                                    commit_owner_id = commit.from_participant.id
+                                    if commit_owner_id not in participants_to_clean:
+                                        participants_to_clean.add(commit_owner_id)
+                                        commitments_to_check.append(commit)
                     
-                    # Remove all needs from the chain
-                    offer.outstanding_needs = [
-                        n for n in offer.outstanding_needs 
-                        if not (n.owner.id in participants_to_clean and not n.created_by_offer)
-                    ]
+                        # Remove all needs from the chain; the owner index tells us whether there are any
+                        stale_needs = {
+                            id(n)
+                            for owner_id in participants_to_clean
+                            for n in offer.needs_owned_by(owner_id)
+                            if not n.created_by_offer
+                        }
+                        if stale_needs:
+                            offer.outstanding_needs = [
+                                n for n in offer.outstanding_needs if id(n) not in stale_needs
+                            ]
                     
-                    # Remove all commitments from the chain (including the let_window commitment)
-                    offer.partial_commitments = [
-                        c for c in offer.partial_commitments
-                        if c.from_participant.id not in participants_to_clean
-                    ]
-                
-                # Create simple direct swap: participant covers let_window, requester covers needs_window
-                # Note: record_direct_swap doesn't require the need to exist, it just records the swap
-                swap = offer.record_direct_swap(participant=participant, swap_window=needs_window)
-                self.repository.update(offer)
-                self._apply_direct_override(offer, swap.participant, swap.in_exchange_for)
-                notifications, _ = self._require_slack_ports()
-                notifications.notify_direct_swap(offer, swap.participant, swap.in_exchange_for)
-                return swap
-            
-            # Direct swap covering a ring need (not let_window)
-            need = offer.find_need(covers_window)
-            if not need:
-                # Check if this might be covering let_window with different times/dates
-                # (e.g., let_window is Nov 9, covers_window is Nov 9-10)
-                if (covers_window_start_date <= let_window_end_date
-                    and let_window_start_date <= covers_window_end_date):
-                    # This overlaps with let_window, check if there's a commitment
-                    let_commitment = next(
-                        (c for c in offer.partial_commitments 
-                         if c.window.start.date() == let_window_start_date),
-                        None,
-                    )
-                    if let_commitment:
-                        # Cancel commitment and create direct swap
+                        # Remove all commitments from the chain (including the let_window commitment)
                         offer.partial_commitments = [
-                            c for c in offer.partial_commitments 
-                            if not (c.window.start.date() == let_window_start_date)
-                        ]
-                        offer.outstanding_needs = [
-                            n for n in offer.outstanding_needs 
-                            if not (n.owner.id == let_commitment.from_participant.id and not n.created_by_offer)
+                            c for c in offer.partial_commitments
+                            if c.from_participant.id not in participants_to_clean
                         ]
-                        swap = offer.record_direct_swap(participant=participant, swap_window=needs_window)
-                        self.repository.update(offer)
-                        self._apply_direct_override(offer, swap.participant, swap.in_exchange_for)
-                        notifications, _ = self._require_slack_ports()
-                        notifications.notify_direct_swap(offer, swap.participant, swap.in_exchange_for)
-                        return swap
                 
-                # Debug: log what needs exist
-                self.logger.debug(
-                    "No need found for window %s. Outstanding needs: %s",
-                    covers_window,
-                    [(n.window.start, n.window.end) for n in offer.outstanding_needs],
-                )
-                raise ValueError(f"No outstanding need matches window {covers_window}")
+                    # Create simple direct swap: participant covers let_window, requester covers needs_window
+                    # Note: record_direct_swap doesn't require the need to exist, it just records the swap
+                    swap = offer.record_direct_swap(participant=participant, swap_window=needs_window)
+                    outbox.save(offer)
+                    self._apply_direct_override(outbox, offer, swap.participant, swap.in_exchange_for)
+                    outbox.notify(notifications.notify_direct_swap, offer, swap.participant, swap.in_exchange_for)
+                    return swap
+            
+                # Direct swap covering a ring need (not let_window)
+                need = offer.find_need(covers_window)
+                if not need:
+                    # Check if this might be covering let_window with different times/dates
+                    # (e.g., let_window is Nov 9, covers_window is Nov 9-10)
+                    if covers_let_window:
+                        # This overlaps with let_window, check if there's a commitment
+                        let_commitment = next(
+                            (c for c in offer.commitments_on(let_window_start_date)
+                             if c.window.start_date == let_window_start_date),
+                            None,
+                        )
+                        if let_commitment:
+                            let_owner_id = let_commitment.from_participant.id
+                            # Cancel commitment and create direct swap
+                            offer.partial_commitments = [
+                                c for c in offer.partial_commitments 
+                                if not (c.window.start_date == let_window_start_date)
+                            ]
+                            offer.outstanding_needs = [
+                                n for n in offer.outstanding_needs 
+                                if not (n.owner.id == let_owner_id and not n.created_by_offer)
+                            ]
+                            swap = offer.record_direct_swap(participant=participant, swap_window=needs_window)
+                            outbox.save(offer)
+                            self._apply_direct_override(outbox, offer, swap.participant, swap.in_exchange_for)
+                            outbox.notify(notifications.notify_direct_swap, offer, swap.participant, swap.in_exchange_for)
+                            return swap
+                
+                    # Debug: log what needs exist
+                    self.logger.debug(
+                        "No need found for window %s. Outstanding needs: %s",
+                        covers_window,
+                        [(n.window.start, n.window.end) for n in offer.outstanding_needs],
+                    )
+                    raise ValueError(f"No outstanding need matches window {covers_window}")
 
-            # Ring swap closure - build full chain of assignments
-            # Start with: participant covers covers_window
-            assignments = [
-                OnCallAssignment(participant=participant, window=covers_window),
-            ]
+                # Ring swap closure - build full chain of assignments
+                # Start with: participant covers covers_window
+                assignments = [
+                    OnCallAssignment(participant=participant, window=covers_window),
+                ]
             
-            # Track participants already in the chain to avoid duplicates
-            participants_in_chain = {participant.id}
+                # Track participants already in the chain to avoid duplicates
+                participants_in_chain = {participant_id}
             
-            # Find who covers the let_window (the original need)
-            # If there are multiple commitments, pick one that doesn't create a cycle
-            let_commitment = None
-            for commit in offer.partial_commitments:
-                if (commit.window.start.date() <= offer.let_window.end.date()
-                    and offer.let_window.start.date() <= commit.window.end.date()):
-                    # Prefer a commitment from someone not already in the chain
-                    if commit.from_participant.id not in participants_in_chain:
-                        let_commitment = commit
-                        break
-            # If all commitments are from people already in chain, use the first one
-            if not let_commitment:
-                let_commitment = next(
-                    (c for c in offer.partial_commitments
-                     if (c.window.start.date() <= offer.let_window.end.date()
-                         and offer.let_window.start.date() <= c.window.end.date())),
-                    None,
-                )
+                # Find who covers the let_window (the original need)
+                # If there are multiple commitments, pick one that doesn't create a cycle
+                # Prefer a commitment from someone not already in the chain;
+                # if all commitments are from people already in chain, use the first one
+                outside_chain, first_commitment = self._find_let_commitment(offer, participants_in_chain)
+                let_commitment = outside_chain or first_commitment
             
-            if let_commitment and let_commitment.from_participant.id not in participants_in_chain:
-                # Add the commitment: let_commitment.from_participant covers let_window
-                assignments.append(
-                    OnCallAssignment(participant=let_commitment.from_participant, window=offer.let_window)
-                )
-                participants_in_chain.add(let_commitment.from_participant.id)
+                let_owner_id = let_commitment.from_participant.id if let_commitment else None
+                if let_commitment and let_owner_id not in participants_in_chain:
+                    # Add the commitment: let_commitment.from_participant covers let_window
+                    assignments.append(
+                        OnCallAssignment(participant=let_commitment.from_participant, window=offer.let_window)
+                    )
+                    participants_in_chain.add(let_owner_id)
                 
-                # Find what let_commitment.from_participant needs
-                let_participant_need = next(
-                    (n for n in offer.outstanding_needs if n.owner.id == let_commitment.from_participant.id),
-                    None,
-                )
-                if let_participant_need and let_participant_need.window.to_tuple() == covers_window.to_tuple():
-                    # This need is being covered by the current participant
-                    # The requester will cover needs_window
-                    if offer.requester.id not in participants_in_chain:
-                        assignments.append(
-                            OnCallAssignment(participant=offer.requester, window=needs_window)
-                        )
+                    # Find what let_commitment.from_participant needs
+                    let_participant_needs = offer.needs_owned_by(let_owner_id)
+                    let_participant_need = let_participant_needs[0] if let_participant_needs else None
+                    if let_participant_need and let_participant_need.window.to_tuple() == covers_window.to_tuple():
+                        # This need is being covered by the current participant
+                        # The requester will cover needs_window
+                        if requester_id not in participants_in_chain:
+                            assignments.append(
+                                OnCallAssignment(participant=offer.requester, window=needs_window)
+                            )
+                    else:
+                        # The requester covers needs_window
+                        if requester_id not in participants_in_chain:
+                            assignments.append(
+                                OnCallAssignment(participant=offer.requester, window=needs_window)
+                            )
                 else:
-                    # The requester covers needs_window
-                    if offer.requester.id not in participants_in_chain:
+                    # No valid commitment for let_window (or would create duplicate), requester covers needs_window
+                    if requester_id not in participants_in_chain:
                         assignments.append(
                             OnCallAssignment(participant=offer.requester, window=needs_window)
                         )
-            else:
-                # No valid commitment for let_window (or would create duplicate), requester covers needs_window
-                if offer.requester.id not in participants_in_chain:
-                    assignments.append(
-                        OnCallAssignment(participant=offer.requester, window=needs_window)
-                    )
 
-            # Apply overrides for ring swap closure
-            self.override_port.apply_overrides(offer.schedule_id, assignments)
-            offer.status = OfferStatus.FULFILLED
-            offer.outstanding_needs = []
-            self.repository.update(offer)
-            notifications, _ = self._require_slack_ports()
-            notifications.notify_direct_swap(offer, participant, needs_window, all_assignments=assignments)
-            return None
+                # Queue overrides for ring swap closure
+                outbox.add_overrides(offer.schedule_id, assignments)
+                outbox.fulfil(offer)
+                outbox.notify(notifications.notify_direct_swap, offer, participant, needs_window, all_assignments=assignments)
+                return None
 
-        # Ring swap: needs_window is not in search_windows
-        need = offer.find_need(covers_window)
+            # Ring swap: needs_window is not in search_windows
+            need = offer.find_need(covers_window)
         
-        # Special case: if covers_window matches let_window and there's already a commitment,
-        # allow creating another commitment (multiple people can commit to cover let_window)
-        if not need:
-            # Check if this is covering let_window
-            if (covers_window.start.date() <= offer.let_window.end.date()
-                and offer.let_window.start.date() <= covers_window.end.date()):
-                # Check if there's already a commitment for let_window
-                existing_commitment = next(
-                    (c for c in offer.partial_commitments
-                     if (c.window.start.date() <= offer.let_window.end.date()
-                         and offer.let_window.start.date() <= c.window.end.date())),
-                    None,
-                )
-                if existing_commitment:
-                    # Multiple people can commit to cover let_window
-                    # Create a need for let_window if it doesn't exist (it was resolved by first commitment)
-                    # But we'll use the original let_window need concept
-                    # Actually, we should create a commitment without resolving a need
-                    # Since the need was already resolved, we'll create a new need entry for tracking
-                    need = WindowNeed(owner=offer.requester, window=offer.let_window, created_by_offer=True)
-                    # Don't add it to outstanding_needs since it's already been committed to
-                    # Just create the commitment
-                    offer.add_commitment(participant, need)
-                    # Add new need for what the participant wants
-                    if needs_window.start.date() not in {n.window.start.date() for n in offer.outstanding_needs}:
-                        offer.outstanding_needs.append(
-                            WindowNeed(owner=participant, window=needs_window, created_by_offer=False)
-                        )
-                    self.repository.update(offer)
-                    notifications, _ = self._require_slack_ports()
-                    notifications.notify_ring_update(offer)
-                    return None
+            # Special case: if covers_window matches let_window and there's already a commitment,
+            # allow creating another commitment (multiple people can commit to cover let_window)
+            if not need:
+                # Check if this is covering let_window
+                if covers_let_window:
+                    # Check if there's already a commitment for let_window
+                    if offer.commitments_overlapping(offer.let_window):
+                        # Multiple people can commit to cover let_window
+                        # Create a need for let_window if it doesn't exist (it was resolved by first commitment)
+                        # But we'll use the original let_window need concept
+                        # Actually, we should create a commitment without resolving a need
+                        # Since the need was already resolved, we'll create a new need entry for tracking
+                        need = WindowNeed(owner=offer.requester, window=offer.let_window, created_by_offer=True)
+                        # Don't add it to outstanding_needs since it's already been committed to
+                        # Just create the commitment
+                        offer.add_commitment(participant, need)
+                        # Add new need for what the participant wants
+                        if not offer.has_need_starting_on(needs_window_start_date):
+                            offer.add_need(WindowNeed(owner=participant, window=needs_window, created_by_offer=False))
+                        outbox.save(offer)
+                        outbox.notify(notifications.notify_ring_update, offer)
+                        return None
         
-        if not need:
-            # Debug: log what needs exist
-            self.logger.debug(
-                "No need found for window %s. Outstanding needs: %s",
-                covers_window,
-                [(n.window.start, n.window.end) for n in offer.outstanding_needs],
-            )
-            raise ValueError(f"No outstanding need matches window {covers_window}")
-
-        # Add commitment and create new need
-        offer.add_commitment(participant, need)
-        offer.resolve_need(covers_window)  # Remove the covered need
-
-        # Add new need for what the participant wants
-        if needs_window.start.date() not in {n.window.start.date() for n in offer.outstanding_needs}:
-            offer.outstanding_needs.append(
-                WindowNeed(owner=participant, window=needs_window, created_by_offer=False)
-            )
-
-        self.repository.update(offer)
-        notifications, _ = self._require_slack_ports()
-        notifications.notify_ring_update(offer)
-        return None
+            if not need:
+                # Debug: log what needs exist
+                self.logger.debug(
+                    "No need found for window %s. Outstanding needs: %s",
+                    covers_window,
+                    [(n.window.start, n.window.end) for n in offer.outstanding_needs],
+                )
+                raise ValueError(f"No outstanding need matches window {covers_window}")
+
+            # Add commitment and create new need
+            offer.add_commitment(participant, need)
+            offer.resolve_need(covers_window)  # Remove the covered need
+
+            # Add new need for what the participant wants
+            if not offer.has_need_starting_on(needs_window_start_date):
+                offer.add_need(WindowNeed(owner=participant, window=needs_window, created_by_offer=False))
+
+            outbox.save(offer)
+            outbox.notify(notifications.notify_ring_update, offer)
+            return None
 
     # Helpers -----------------------------------------------------------------
 
-    def _apply_direct_override(self, offer: SwapOffer, participant: Participant, swap_window: TimeWindow) -> None:
+    @contextmanager
+    def _outbox(self) -> Iterator[_PendingIO]:
+        """Collect offer writes and outbound calls, flushing them once the use-case has succeeded.
+
+        Overrides are coalesced into a single ``apply_overrides`` call per schedule and
+        applied first, so that a failing Opsgenie call leaves offers open for a retry.
+        Offers queued with ``fulfil`` are then closed, each changed offer is written
+        once, and notifications are sent. Nothing is flushed if the block raises.
+        """
+        outbox = _PendingIO()
+        yield outbox
+        for schedule_id, assignments in outbox.overrides.items():
+            self.override_port.apply_overrides(schedule_id, assignments)
+        for offer in outbox.fulfilled:
+            offer.status = OfferStatus.FULFILLED
+            offer.outstanding_needs = []
+        for offer in outbox.offers.values():
+            self.repository.update(offer)
+        for notify in outbox.notifications:
+            notify()
+
+    def _apply_direct_override(
+        self, outbox: _PendingIO, offer: SwapOffer, participant: Participant, swap_window: TimeWindow
+    ) -> None:
         assignments = [
             OnCallAssignment(participant=participant, window=offer.let_window),
             OnCallAssignment(participant=offer.requester, window=swap_window),
         ]
-        self.override_port.apply_overrides(offer.schedule_id, assignments)
+        outbox.add_overrides(offer.schedule_id, assignments)
 
 
+    @staticmethod
+    def _find_let_commitment(
+        offer: SwapOffer, participants_in_chain: Collection[UUID]
+    ) -> Tuple[Optional[RingSwapCommitment], Optional[RingSwapCommitment]]:
+        """Single pass over the let-window commitments.
+
+        Returns the first commitment from a participant outside ``participants_in_chain``
+        and the first commitment overall; either is ``None`` when there is no match.
+        """
+        first = None
+        for commit in offer.commitments_overlapping(offer.let_window):
+            if first is None:
+                first = commit
+            if commit.from_participant.id not in participants_in_chain:
+                return commit, first
+        return None, first
+
     def _get_offer(self, offer_id: UUID) -> SwapOffer:
         offer = self.repository.get(offer_id)
         if offer is None:
@@ -370,7 +406,7 @@ class SwapNegotiationService:
         return [
             assignment.window
             for assignment in assignments
-            if assignment.participant.email.lower() == target_email
+            if assignment.participant.email_lower == target_email
         ]
 
     def get_offer(self, offer_id: UUID) -> SwapOffer:
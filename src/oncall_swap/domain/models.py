@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
-from typing import Iterable, List, Optional, Sequence, Tuple
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 
 from oncall_swap.domain.time import Instant
 
@@ -14,7 +15,21 @@ def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-class TimeWindow(BaseModel):
+class _FrozenModel(BaseModel):
+    """Immutable model, so values derived from its fields can be cached with ``cached_property``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> Any:
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            # The copied __dict__ carries our cached values; drop them so they are derived again
+            for name in [name for name in copy.__dict__ if name not in type(self).model_fields]:
+                del copy.__dict__[name]
+        return copy
+
+
+class TimeWindow(_FrozenModel):
     """Represents a closed-open time interval [start, end)."""
 
     start: datetime
@@ -40,16 +55,43 @@ class TimeWindow(BaseModel):
             return None
         return TimeWindow(start=max(self.start, other.start), end=min(self.end, other.end))
 
-    def to_tuple(self) -> Tuple[datetime, datetime]:
+    @cached_property
+    def bounds(self) -> Tuple[datetime, datetime]:
+        """The ``(start, end)`` pair, built once so set/dict keys reuse the same tuple."""
         return self.start, self.end
 
+    def to_tuple(self) -> Tuple[datetime, datetime]:
+        return self.bounds
+
+    @cached_property
+    def start_date(self) -> date:
+        return self.start.date()
+
+    @cached_property
+    def end_date(self) -> date:
+        return self.end.date()
+
+    def overlaps_by_date(self, other: "TimeWindow") -> bool:
+        """Whether the two windows share at least one calendar date, regardless of time of day."""
+        return self.start_date <= other.end_date and other.start_date <= self.end_date
+
+    def dates(self) -> List[date]:
+        """Calendar dates touched by the window, from the start date through the end date."""
+        first, last = self.start_date, self.end_date
+        return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
 
-class Participant(BaseModel):
+
+class Participant(_FrozenModel):
     id: UUID = Field(default_factory=uuid4)
     email: str
     slack_user_id: Optional[str] = None
     opsgenie_user_id: Optional[str] = None
 
+    @cached_property
+    def email_lower(self) -> str:
+        """Case-normalized email used for identity comparisons."""
+        return self.email.lower()
+
 
 class OfferStatus(str, Enum):
     ACTIVE = "active"
@@ -125,6 +167,11 @@ class SwapOffer(BaseModel):
     outstanding_needs: List[WindowNeed] = Field(default_factory=list)
     partial_commitments: List[RingSwapCommitment] = Field(default_factory=list)
 
+    # Lookup indexes over the lists above, built on first use and dropped whenever a list is reassigned.
+    _commitments_by_date: Optional[Dict[date, List[RingSwapCommitment]]] = PrivateAttr(default=None)
+    _needs_by_owner: Optional[Dict[UUID, List[WindowNeed]]] = PrivateAttr(default=None)
+    _needs_by_date: Optional[Dict[date, List[WindowNeed]]] = PrivateAttr(default=None)
+
     def __init__(self, **data):
         super().__init__(**data)
         if not self.available_windows:
@@ -132,9 +179,25 @@ class SwapOffer(BaseModel):
         if not self.outstanding_needs:
             self.outstanding_needs = [WindowNeed(owner=self.requester, window=self.let_window, created_by_offer=True)]
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "partial_commitments":
+            self._commitments_by_date = None
+        elif name == "outstanding_needs":
+            self._needs_by_owner = None
+            self._needs_by_date = None
+
+    @cached_property
+    def search_window_dates(self) -> FrozenSet[date]:
+        """Start dates of the search windows, which never change once the offer exists."""
+        return frozenset(window.start_date for window in self.search_windows)
+
     def add_available_windows(self, windows: Iterable[TimeWindow]) -> None:
+        known = {existing.to_tuple() for existing in self.available_windows}
         for window in windows:
-            if not any(existing.to_tuple() == window.to_tuple() for existing in self.available_windows):
+            key = window.to_tuple()
+            if key not in known:
+                known.add(key)
                 self.available_windows.append(window)
 
     def find_need(self, window: TimeWindow) -> Optional[WindowNeed]:
@@ -144,39 +207,61 @@ class SwapOffer(BaseModel):
         since windows may come from different sources (date picker vs Opsgenie)
         with different times but represent the same day(s).
         """
-        window_start_date = window.start.date()
-        window_end_date = window.end.date()
-        
-        for need in self.outstanding_needs:
-            need_start_date = need.window.start.date()
-            need_end_date = need.window.end.date()
-            
-            # Check if the windows overlap by date
-            # Windows overlap if they share at least one day
-            if window_start_date <= need_end_date and need_start_date <= window_end_date:
-                return need
-        return None
+        matches = self.needs_overlapping(window)
+        return matches[0] if matches else None
 
     def resolve_need(self, window: TimeWindow) -> Optional[WindowNeed]:
         """Remove a need that matches the given window.
         
         Uses the same date-based matching as find_need.
         """
-        need = self.find_need(window)
-        if need:
-            # Remove the matched need by comparing date ranges
-            window_start_date = window.start.date()
-            window_end_date = window.end.date()
-            self.outstanding_needs = [
-                existing
-                for existing in self.outstanding_needs
-                if not (
-                    existing.window.start.date() <= window_end_date
-                    and window_start_date <= existing.window.end.date()
-                )
-            ]
+        matches = self.needs_overlapping(window)
+        if not matches:
+            return None
+        # Remove every need sharing a date with the window
+        resolved = {id(need) for need in matches}
+        self.outstanding_needs = [existing for existing in self.outstanding_needs if id(existing) not in resolved]
+        return matches[0]
+
+    def add_need(self, need: WindowNeed) -> WindowNeed:
+        self.outstanding_needs.append(need)
+        if self._needs_by_owner is not None:
+            self._needs_by_owner.setdefault(need.owner.id, []).append(need)
+        if self._needs_by_date is not None:
+            for day in need.window.dates():
+                self._needs_by_date.setdefault(day, []).append(need)
         return need
 
+    def needs_on(self, day: date) -> List[WindowNeed]:
+        """Outstanding needs whose window touches the given date, in insertion order."""
+        if self._needs_by_date is None:
+            index: Dict[date, List[WindowNeed]] = {}
+            for need in self.outstanding_needs:
+                for covered in need.window.dates():
+                    index.setdefault(covered, []).append(need)
+            self._needs_by_date = index
+        return self._needs_by_date.get(day, [])
+
+    def needs_overlapping(self, window: TimeWindow) -> List[WindowNeed]:
+        """Outstanding needs sharing at least one date with the window, in insertion order."""
+        days = window.dates()
+        if len(days) == 1:
+            return self.needs_on(days[0])
+        matched = {id(n) for day in days for n in self.needs_on(day)}
+        return [n for n in self.outstanding_needs if id(n) in matched]
+
+    def has_need_starting_on(self, day: date) -> bool:
+        return any(need.window.start_date == day for need in self.needs_on(day))
+
+    def needs_owned_by(self, owner_id: UUID) -> List[WindowNeed]:
+        """Outstanding needs owned by the given participant, in insertion order."""
+        if self._needs_by_owner is None:
+            index: Dict[UUID, List[WindowNeed]] = {}
+            for need in self.outstanding_needs:
+                index.setdefault(need.owner.id, []).append(need)
+            self._needs_by_owner = index
+        return self._needs_by_owner.get(owner_id, [])
+
     def add_commitment(self, coverer: Participant, need: WindowNeed) -> RingSwapCommitment:
         commitment = RingSwapCommitment(
             from_participant=coverer,
@@ -184,8 +269,29 @@ class SwapOffer(BaseModel):
             window=need.window,
         )
         self.partial_commitments.append(commitment)
+        if self._commitments_by_date is not None:
+            for day in commitment.window.dates():
+                self._commitments_by_date.setdefault(day, []).append(commitment)
         return commitment
 
+    def commitments_on(self, day: date) -> List[RingSwapCommitment]:
+        """Partial commitments whose window touches the given date, in insertion order."""
+        if self._commitments_by_date is None:
+            index: Dict[date, List[RingSwapCommitment]] = {}
+            for commitment in self.partial_commitments:
+                for covered in commitment.window.dates():
+                    index.setdefault(covered, []).append(commitment)
+            self._commitments_by_date = index
+        return self._commitments_by_date.get(day, [])
+
+    def commitments_overlapping(self, window: TimeWindow) -> List[RingSwapCommitment]:
+        """Partial commitments sharing at least one date with the window, in insertion order."""
+        days = window.dates()
+        if len(days) == 1:
+            return self.commitments_on(days[0])
+        matched = {id(c) for day in days for c in self.commitments_on(day)}
+        return [c for c in self.partial_commitments if id(c) in matched]
+
     def record_direct_swap(self, participant: Participant, swap_window: TimeWindow) -> DirectSwap:
         swap = DirectSwap(participant=participant, covers_window=self.let_window, in_exchange_for=swap_window)
         self.direct_agreements.append(swap)
@@ -200,9 +306,8 @@ class SwapOffer(BaseModel):
         candidate = RingCandidate(participant=participant, covers_window=self.let_window, needs_windows=list(needs_windows))
         self.ring_candidates.append(candidate)
         self.add_available_windows(candidate.needs_windows)
-        self.outstanding_needs.extend(
-            WindowNeed(owner=participant, window=need, created_by_offer=False) for need in needs_windows
-        )
+        for need in needs_windows:
+            self.add_need(WindowNeed(owner=participant, window=need, created_by_offer=False))
         return candidate
 
     def record_ring_swap(self, ring: RingSwap) -> RingSwap:
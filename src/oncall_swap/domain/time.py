@@ -1,29 +1,33 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-
-class Instant(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Instant:
     """Represents a timezone-aware point in time (UTC-normalized)."""
 
-    value: datetime = Field(alias="at")
-    model_config = ConfigDict(populate_by_name=True)
+    at: datetime
 
-    @model_validator(mode="after")
-    def _normalize_timezone(self) -> "Instant":
-        moment = self.value
+    def __post_init__(self) -> None:
+        moment = self.at
+        if moment.tzinfo is timezone.utc:
+            # Already normalized; the common case for callers passing UTC datetimes
+            return
         if moment.tzinfo is None:
             moment = moment.replace(tzinfo=timezone.utc)
         else:
             moment = moment.astimezone(timezone.utc)
-        object.__setattr__(self, "value", moment)
-        return self
+        object.__setattr__(self, "at", moment)
+
+    @property
+    def value(self) -> datetime:
+        return self.at
 
     @classmethod
     def utc_now(cls) -> "Instant":
         return cls(at=datetime.now(timezone.utc))
 
     def to_datetime(self) -> datetime:
-        return self.value
+        return self.at
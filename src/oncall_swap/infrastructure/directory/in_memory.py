@@ -16,7 +16,6 @@ class InMemoryParticipantDirectory(ParticipantDirectoryPort):
         return self._by_email.get(email.lower())
 
     def upsert(self, participant: Participant) -> Participant:
-        normalized_email = participant.email.lower()
-        self._by_email[normalized_email] = participant
+        self._by_email[participant.email_lower] = participant
         self._by_id[participant.id] = participant
         return participant
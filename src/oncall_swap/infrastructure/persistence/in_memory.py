@@ -8,14 +8,16 @@ from oncall_swap.ports.persistence import OfferRepository
 
 
 class InMemoryOfferRepository(OfferRepository):
+    __slots__ = ("_storage",)
+
     def __init__(self) -> None:
         self._storage: Dict[UUID, SwapOffer] = {}
 
-    def add(self, offer: SwapOffer) -> None:
+    def save(self, offer: SwapOffer) -> None:
         self._storage[offer.id] = offer
 
+    # Inserting and replacing an offer are the same dict write
+    add = update = save
+
     def get(self, offer_id: UUID) -> Optional[SwapOffer]:
         return self._storage.get(offer_id)
-
-    def update(self, offer: SwapOffer) -> None:
-        self._storage[offer.id] = offer
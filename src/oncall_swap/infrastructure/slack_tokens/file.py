@@ -1,86 +1,383 @@
 from __future__ import annotations
 
+import atexit
 import json
+import logging
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
 
-from slack_bolt.oauth import InstallationStore
-from slack_sdk.oauth import Installation
+try:
+    import fcntl
+except ImportError:  # not available on Windows; processes there must not share the files
+    fcntl = None
 
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib encoder
+    orjson = None
+
+from slack_sdk.oauth.installation_store import Installation, InstallationStore
+
+from oncall_swap.infrastructure.slack_tokens.token_index import TokenIndexMixin
 from oncall_swap.ports.slack_tokens import SlackTokenStorage
 
+# Installation attributes persisted for every team, and those written only when set
+_REQUIRED_FIELDS = ("team_id", "bot_token", "bot_id", "bot_user_id")
+_OPTIONAL_FIELDS = (
+    "user_token",
+    "user_id",
+    "user_refresh_token",
+    "user_token_expires_at",
+    "enterprise_id",
+    "installed_at",
+)
+_get_required = attrgetter(*_REQUIRED_FIELDS)
+_get_optional = attrgetter(*_OPTIONAL_FIELDS)
+
+logger = logging.getLogger(__name__)
+
+# Mutations arriving within this window are coalesced into a single write
+_FLUSH_DELAY_SECONDS = 0.05
+# After a failed flush the retry delay doubles up to this cap
+_FLUSH_RETRY_MAX_SECONDS = 60.0
+_WRITE_BUFFER_SIZE = 65536
+# The log is folded into the snapshot once it holds this many entries per installation
+_COMPACT_RATIO = 10
+
+
+def _dumps(data: Any, pretty: bool = False) -> bytes:
+    """Encode ``data`` as newline-terminated JSON, compact unless ``pretty`` is set."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return (json.dumps(data, indent=2) + "\n").encode()
+    return (json.dumps(data, separators=(",", ":")) + "\n").encode()
+
+
+def _loads(payload: bytes) -> Any:
+    """Decode JSON read from disk as raw bytes."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _serialize(installation: Installation) -> Dict[str, Any]:
+    """Convert an installation to a JSON-ready dict, keeping optional fields only if set."""
+    installation_dict = dict(zip(_REQUIRED_FIELDS, _get_required(installation)))
+    for name, value in zip(_OPTIONAL_FIELDS, _get_optional(installation)):
+        if value:
+            installation_dict[name] = value
+    return installation_dict
+
 
-class FileSlackTokenStorage(InstallationStore, SlackTokenStorage):
+def _flush_at_exit(storage_ref: weakref.ref) -> None:
+    """Exit hook that flushes a storage only if it is still alive; the weak reference lets it be collected."""
+    storage = storage_ref()
+    if storage is not None:
+        storage.flush()
+
+
+class FileSlackTokenStorage(TokenIndexMixin, InstallationStore, SlackTokenStorage):
     """File-based storage for Slack workspace installation tokens.
     
-    Stores installations in a JSON file on disk. Implements both slack-bolt's
-    InstallationStore interface and our custom SlackTokenStorage interface.
+    Stores installations in a JSON snapshot on disk plus a JSON-lines log of
+    later mutations (``<storage_path>.log``); loading replays the log over the
+    snapshot. Implements both slack-bolt's InstallationStore interface and our
+    custom SlackTokenStorage interface.
+
+    Writes are debounced: mutations are collected and a flush shortly
+    afterwards appends one line per changed team to the log. Once the log
+    holds ``_COMPACT_RATIO`` entries per installation it is compacted into a
+    fresh snapshot and truncated. Call ``flush()`` to write immediately;
+    pending changes are also flushed at interpreter exit while the instance
+    is alive. ``close()`` flushes and removes that exit hook.
+
+    The snapshot is always replaced through a temporary file and an atomic
+    rename, so readers never see it half-written. By default nothing is
+    fsynced: tokens can be re-issued through OAuth, so losing the last writes
+    in a crash is an acceptable trade for cheaper writes. Pass
+    ``durable=True`` to fsync log appends and snapshot writes.
+
+    The snapshot is written as compact JSON; pass ``pretty=True`` to indent it
+    for reading while debugging.
+
+    Several processes may share the same files. Every flush bumps a version
+    number stored in the snapshot envelope and in a small sibling
+    ``<storage_path>.version`` file. Reads compare that number with the one
+    this instance last loaded or wrote and reload when it has moved. Writers
+    hold an exclusive ``flock`` on ``<storage_path>.lock`` and catch up with
+    other processes' flushes before appending or compacting; reloads hold it
+    shared and never modify the files.
     """
 
-    def __init__(self, storage_path: str | Path) -> None:
+    def __init__(self, storage_path: str | Path, durable: bool = False, pretty: bool = False) -> None:
         """Initialize file-based token storage.
         
         Args:
             storage_path: Path to the JSON file where installations will be stored.
+            durable: Fsync log appends and snapshot writes.
+            pretty: Indent the snapshot file.
         """
         self.storage_path = Path(storage_path)
+        self.log_path = self.storage_path.with_suffix(self.storage_path.suffix + ".log")
+        self.version_path = self.storage_path.with_suffix(self.storage_path.suffix + ".version")
+        self.lock_path = self.storage_path.with_suffix(self.storage_path.suffix + ".lock")
+        self.durable = durable
+        self.pretty = pretty
         self._installations: Dict[str, Installation] = {}
-        self._load_from_disk()
+        # Teams changed since the last flush, mapped to their installation or None once deleted
+        self._pending: Dict[str, Optional[Installation]] = {}
+        self._log_entries = 0
+        # Version of the files as of our last load or flush
+        self._version = 0
+        self._init_index()
+        self._lock = threading.RLock()
+        # Serializes disk access within the process; taken before the inter-process
+        # lock, which is taken before _lock. _lock only guards the in-memory state
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        # Consecutive failed flushes, driving the retry backoff
+        self._flush_failures = 0
+        with self._write_lock, self._interprocess_lock(shared=True):
+            self._reload()
+        self._exit_hook = partial(_flush_at_exit, weakref.ref(self))
+        atexit.register(self._exit_hook)
+        # Drop the hook once the instance is collected without close()
+        weakref.finalize(self, atexit.unregister, self._exit_hook).atexit = False
+
+    def flush(self) -> None:
+        """Write pending changes to disk now."""
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return
+                pending, self._pending = self._pending, {}
+                self._dirty = False
+            try:
+                with self._interprocess_lock():
+                    if self._read_version() != self._version:
+                        # Another process flushed since we last loaded; build on its state
+                        # so that neither our log entries nor a compaction drop its changes
+                        self._reload(pending)
+                    with self._lock:
+                        compact = self._log_entries + len(pending) >= _COMPACT_RATIO * max(len(self._installations), 1)
+                        installations = dict(self._installations) if compact else None
+                    self._version += 1
+                    if installations is not None:
+                        self._compact(installations)
+                    else:
+                        self._append_to_log(pending)
+                    self._write_version()
+            except Exception:
+                with self._lock:
+                    # Keep the changes queued; newer ones recorded meanwhile take precedence
+                    self._pending = {**pending, **self._pending}
+                    self._dirty = True
+                    self._flush_failures += 1
+                    if self._flush_failures == 1:
+                        logger.warning(
+                            "Could not write Slack tokens to %s; retrying with backoff",
+                            self.storage_path,
+                            exc_info=True,
+                        )
+                    delay = min(_FLUSH_DELAY_SECONDS * 2**self._flush_failures, _FLUSH_RETRY_MAX_SECONDS)
+                    self._start_flush_timer(delay)
+                raise
+            if self._flush_failures:
+                logger.info("Slack tokens written to %s after %d failed attempts", self.storage_path, self._flush_failures)
+                self._flush_failures = 0
+
+    def close(self) -> None:
+        """Flush pending changes and stop flushing at interpreter exit."""
+        self.flush()
+        atexit.unregister(self._exit_hook)
+
+    def _schedule_flush(self, team_id: str) -> None:
+        """Record a change to ``team_id`` and start the flush timer if none is pending."""
+        with self._lock:
+            self._pending[team_id] = self._installations.get(team_id)
+            self._dirty = True
+            self._start_flush_timer()
+
+    def _start_flush_timer(self, delay: float = _FLUSH_DELAY_SECONDS) -> None:
+        """Start the flush timer unless one is already running; call with ``_lock`` held."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(delay, self._flush_from_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
 
-    def _load_from_disk(self) -> None:
-        """Load installations from disk."""
+    def _flush_from_timer(self) -> None:
+        """Timer target; a failure is already logged and rescheduled by ``flush``."""
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    @contextmanager
+    def _interprocess_lock(self, shared: bool = False) -> Iterator[None]:
+        """Hold ``flock`` on the lock file: exclusive for writers, shared for reloads."""
+        if fcntl is None:
+            yield
+            return
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a+b") as lock_file:
+            # Released when the file is closed
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+
+    def _read_version(self) -> int:
+        """Return the version last published by any process, or 0 if there is none."""
+        try:
+            return int(self.version_path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_version(self) -> None:
+        """Publish the current version so other processes know to reload."""
+        self._write_file(self.version_path, str(self._version).encode())
+
+    def _refresh_if_stale(self) -> None:
+        """Reload from disk if another process has flushed since our last load or flush."""
+        if self._read_version() == self._version:
+            return
+        with self._write_lock, self._interprocess_lock(shared=True):
+            if self._read_version() != self._version:
+                self._reload()
+
+    def _reload(self, unflushed: Optional[Dict[str, Optional[Installation]]] = None) -> None:
+        """Replace the in-memory state with the files on disk, keeping local changes on top.
+
+        ``unflushed`` holds changes taken out of ``_pending`` by a flush in
+        progress. Call with ``_write_lock`` and the inter-process lock held.
+        """
+        version, installations, log_entries = self._read_from_disk()
+        with self._lock:
+            for team_id, installation in {**(unflushed or {}), **self._pending}.items():
+                if installation is None:
+                    installations.pop(team_id, None)
+                else:
+                    installations[team_id] = installation
+            self._installations = installations
+            self._rebuild_index(installations)
+            self._log_entries = log_entries
+            self._version = version
+
+    def _read_from_disk(self) -> Tuple[int, Dict[str, Installation], int]:
+        """Read the snapshot and replay the log over it; returns (version, installations, log entries)."""
+        snapshot_version = 0
+        installations: Dict[str, Installation] = {}
         if self.storage_path.exists():
             try:
-                with open(self.storage_path, "r") as f:
-                    data = json.load(f)
-                    for team_id, installation_data in data.items():
-                        try:
-                            self._installations[team_id] = Installation(**installation_data)
-                        except (TypeError, ValueError) as e:
-                            # Skip corrupted installation entries
-                            print(f"Warning: Could not load installation for team {team_id}: {e}")
-                            continue
+                data = _loads(self.storage_path.read_bytes())
+                if "teams" in data:
+                    snapshot_version = data.get("version", 0)
+                    data = data["teams"]
+                for team_id, installation_data in data.items():
+                    try:
+                        installations[team_id] = Installation(**installation_data)
+                    except (TypeError, ValueError) as e:
+                        # Skip corrupted installation entries
+                        print(f"Warning: Could not load installation for team {team_id}: {e}")
+                        continue
             except (json.JSONDecodeError, KeyError, TypeError) as e:
                 # If file is corrupted, start fresh
                 print(f"Warning: Could not load token storage from {self.storage_path}: {e}")
-                self._installations = {}
+                installations = {}
+        version = max(self._read_version(), snapshot_version)
+        return version, installations, self._replay_log(installations, snapshot_version)
 
-    def _save_to_disk(self) -> None:
-        """Save installations to disk."""
+    def _replay_log(self, installations: Dict[str, Installation], snapshot_version: int) -> int:
+        """Apply the mutations logged after ``snapshot_version``; returns the number of entries read."""
+        if not self.log_path.exists():
+            return 0
+        entries = 0
+        for line in self.log_path.read_bytes().splitlines():
+            if not line:
+                continue
+            try:
+                entry = _loads(line)
+                team_id = entry["team_id"]
+                entries += 1
+                if entry.get("v", snapshot_version + 1) <= snapshot_version:
+                    # Already folded into the snapshot by a compaction that stopped
+                    # before it could remove this log
+                    continue
+                if entry["op"] == "delete":
+                    installations.pop(team_id, None)
+                else:
+                    installations[team_id] = Installation(**entry["install"])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                # A torn line from an interrupted append; skip it
+                print(f"Warning: Skipping unreadable entry in {self.log_path}: {e}")
+                continue
+        return entries
+
+    def _append_to_log(self, pending: Dict[str, Optional[Installation]]) -> None:
+        """Append one entry per changed team to the mutation log, tagged with the flush version."""
+        version = self._version
+        lines = [
+            _dumps({"op": "delete", "team_id": team_id, "v": version})
+            if installation is None
+            else _dumps({"op": "upsert", "team_id": team_id, "v": version, "install": _serialize(installation)})
+            for team_id, installation in pending.items()
+        ]
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a+b", buffering=_WRITE_BUFFER_SIZE) as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Terminate a torn line left by an interrupted append so ours stays readable
+                    lines.insert(0, b"\n")
+            f.write(b"".join(lines))
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        self._log_entries += len(pending)
+
+    def _compact(self, installations: Dict[str, Installation]) -> None:
+        """Write a full snapshot and truncate the log it supersedes.
+
+        If the process dies between the two steps, the leftover log entries
+        carry versions no newer than the snapshot's and are skipped on replay.
+        """
+        self._save_to_disk(installations)
+        if self.log_path.exists():
+            self.log_path.unlink()
+        self._log_entries = 0
+
+    def _save_to_disk(self, installations: Dict[str, Installation]) -> None:
+        """Save a snapshot of ``installations`` to disk."""
         # Ensure directory exists
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Convert installations to serializable format
-        data = {}
-        for team_id, installation in self._installations.items():
-            installation_dict = {
-                "team_id": installation.team_id,
-                "bot_token": installation.bot_token,
-                "bot_id": installation.bot_id,
-                "bot_user_id": installation.bot_user_id,
-            }
-            # Add optional fields only if they exist
-            if hasattr(installation, "user_token") and installation.user_token:
-                installation_dict["user_token"] = installation.user_token
-            if hasattr(installation, "user_id") and installation.user_id:
-                installation_dict["user_id"] = installation.user_id
-            if hasattr(installation, "user_refresh_token") and installation.user_refresh_token:
-                installation_dict["user_refresh_token"] = installation.user_refresh_token
-            if hasattr(installation, "user_token_expires_at") and installation.user_token_expires_at:
-                installation_dict["user_token_expires_at"] = installation.user_token_expires_at
-            if hasattr(installation, "enterprise_id") and installation.enterprise_id:
-                installation_dict["enterprise_id"] = installation.enterprise_id
-            if hasattr(installation, "installed_at") and installation.installed_at:
-                installation_dict["installed_at"] = installation.installed_at
-            data[team_id] = installation_dict
-        
-        # Write atomically using a temporary file
-        temp_path = self.storage_path.with_suffix(self.storage_path.suffix + ".tmp")
+        data = {
+            "version": self._version,
+            "teams": {team_id: _serialize(installation) for team_id, installation in installations.items()},
+        }
+        self._write_file(self.storage_path, _dumps(data, pretty=self.pretty))
+
+    def _write_file(self, path: Path, payload: bytes) -> None:
+        """Replace the contents of ``path`` atomically, fsynced when durable."""
+        temp_path = path.with_suffix(path.suffix + ".tmp")
         try:
-            with open(temp_path, "w") as f:
-                json.dump(data, f, indent=2)
-            temp_path.replace(self.storage_path)
-        except Exception as e:
+            with open(temp_path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(payload)
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception:
             # Clean up temp file on error
             if temp_path.exists():
                 temp_path.unlink()
@@ -90,8 +387,10 @@ class FileSlackTokenStorage(InstallationStore, SlackTokenStorage):
     def save(self, installation: Installation) -> None:
         """Save installation (slack-bolt interface)."""
         if installation.team_id:
-            self._installations[installation.team_id] = installation
-            self._save_to_disk()
+            with self._lock:
+                self._installations[installation.team_id] = installation
+                self._index(installation.team_id, installation)
+                self._schedule_flush(installation.team_id)
 
     def find_installation(
         self,
@@ -103,14 +402,17 @@ class FileSlackTokenStorage(InstallationStore, SlackTokenStorage):
     ) -> Optional[Installation]:
         """Find installation by team_id (slack-bolt interface)."""
         if team_id:
+            self._refresh_if_stale()
             return self._installations.get(team_id)
         return None
 
     def delete_bot(self, *, team_id: Optional[str] = None, enterprise_id: Optional[str] = None) -> None:
         """Delete bot installation (slack-bolt interface)."""
         if team_id:
-            self._installations.pop(team_id, None)
-            self._save_to_disk()
+            with self._lock:
+                self._installations.pop(team_id, None)
+                self._unindex(team_id)
+                self._schedule_flush(team_id)
 
     def delete_installation(
         self,
@@ -121,8 +423,10 @@ class FileSlackTokenStorage(InstallationStore, SlackTokenStorage):
     ) -> None:
         """Delete installation (slack-bolt interface)."""
         if team_id:
-            self._installations.pop(team_id, None)
-            self._save_to_disk()
+            with self._lock:
+                self._installations.pop(team_id, None)
+                self._unindex(team_id)
+                self._schedule_flush(team_id)
 
     # Custom SlackTokenStorage interface (for backward compatibility)
     def save_installation(
@@ -145,20 +449,22 @@ class FileSlackTokenStorage(InstallationStore, SlackTokenStorage):
 
     def get_bot_token(self, team_id: str) -> Optional[str]:
         """Get bot token for a workspace."""
-        installation = self._installations.get(team_id)
-        return installation.bot_token if installation else None
+        self._refresh_if_stale()
+        return self._bot_tokens.get(team_id)
 
     def get_bot_user_id(self, team_id: str) -> Optional[str]:
         """Get bot user ID for a workspace."""
-        installation = self._installations.get(team_id)
-        return installation.bot_user_id if installation else None
+        self._refresh_if_stale()
+        return self._bot_user_ids.get(team_id)
 
     def get_access_token(self, team_id: str) -> Optional[str]:
         """Get access token for a workspace (for user tokens)."""
-        installation = self._installations.get(team_id)
-        return installation.user_token if installation else None
+        self._refresh_if_stale()
+        return self._user_tokens.get(team_id)
 
     def remove_installation(self, team_id: str) -> None:
         """Remove installation for a workspace."""
-        self._installations.pop(team_id, None)
-        self._save_to_disk()
+        with self._lock:
+            self._installations.pop(team_id, None)
+            self._unindex(team_id)
+            self._schedule_flush(team_id)
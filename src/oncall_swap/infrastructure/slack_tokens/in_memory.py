@@ -2,27 +2,33 @@ from __future__ import annotations
 
 from typing import Dict, Optional
 
-from slack_bolt.oauth import InstallationStore
-from slack_sdk.oauth import Installation
+from slack_sdk.oauth.installation_store import Installation, InstallationStore
 
+from oncall_swap.infrastructure.slack_tokens.token_index import TokenIndexMixin
 from oncall_swap.ports.slack_tokens import SlackTokenStorage
 
 
-class InMemorySlackTokenStorage(InstallationStore, SlackTokenStorage):
+class InMemorySlackTokenStorage(TokenIndexMixin, InstallationStore, SlackTokenStorage):
     """In-memory storage for Slack workspace installation tokens.
     
     Implements both slack-bolt's InstallationStore interface and our custom
     SlackTokenStorage interface for compatibility.
     """
 
+    # InstallationStore doesn't declare __slots__, so instances keep a __dict__;
+    # these still resolve through slot descriptors rather than a dict lookup.
+    __slots__ = ("_installations",)
+
     def __init__(self) -> None:
         self._installations: Dict[str, Installation] = {}
+        self._init_index()
 
     # slack-bolt InstallationStore interface
     def save(self, installation: Installation) -> None:
         """Save installation (slack-bolt interface)."""
         if installation.team_id:
             self._installations[installation.team_id] = installation
+            self._index(installation.team_id, installation)
 
     def find_installation(
         self,
@@ -41,6 +47,7 @@ class InMemorySlackTokenStorage(InstallationStore, SlackTokenStorage):
         """Delete bot installation (slack-bolt interface)."""
         if team_id:
             self._installations.pop(team_id, None)
+            self._unindex(team_id)
 
     def delete_installation(
         self,
@@ -52,6 +59,7 @@ class InMemorySlackTokenStorage(InstallationStore, SlackTokenStorage):
         """Delete installation (slack-bolt interface)."""
         if team_id:
             self._installations.pop(team_id, None)
+            self._unindex(team_id)
 
     # Custom SlackTokenStorage interface (for backward compatibility)
     def save_installation(
@@ -74,19 +82,17 @@ class InMemorySlackTokenStorage(InstallationStore, SlackTokenStorage):
 
     def get_bot_token(self, team_id: str) -> Optional[str]:
         """Get bot token for a workspace."""
-        installation = self._installations.get(team_id)
-        return installation.bot_token if installation else None
+        return self._bot_tokens.get(team_id)
 
     def get_bot_user_id(self, team_id: str) -> Optional[str]:
         """Get bot user ID for a workspace."""
-        installation = self._installations.get(team_id)
-        return installation.bot_user_id if installation else None
+        return self._bot_user_ids.get(team_id)
 
     def get_access_token(self, team_id: str) -> Optional[str]:
         """Get access token for a workspace (for user tokens)."""
-        installation = self._installations.get(team_id)
-        return installation.user_token if installation else None
+        return self._user_tokens.get(team_id)
 
     def remove_installation(self, team_id: str) -> None:
         """Remove installation for a workspace."""
         self._installations.pop(team_id, None)
+        self._unindex(team_id)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional
+
+from slack_sdk.oauth.installation_store import Installation
+
+
+class TokenIndexMixin:
+    """Per-field lookups for the token fields read on every Slack event.
+
+    Stores keep their ``Installation`` objects as the source of truth and call
+    ``_index``/``_unindex`` alongside every change, so the hot getters read a
+    plain dict instead of going through the installation's attributes.
+    """
+
+    __slots__ = ("_bot_tokens", "_bot_user_ids", "_user_tokens")
+
+    def _init_index(self) -> None:
+        self._bot_tokens: Dict[str, Optional[str]] = {}
+        self._bot_user_ids: Dict[str, Optional[str]] = {}
+        self._user_tokens: Dict[str, Optional[str]] = {}
+
+    def _index(self, team_id: str, installation: Installation) -> None:
+        self._bot_tokens[team_id] = installation.bot_token
+        self._bot_user_ids[team_id] = installation.bot_user_id
+        self._user_tokens[team_id] = installation.user_token
+
+    def _unindex(self, team_id: str) -> None:
+        self._bot_tokens.pop(team_id, None)
+        self._bot_user_ids.pop(team_id, None)
+        self._user_tokens.pop(team_id, None)
+
+    def _rebuild_index(self, installations: Mapping[str, Installation]) -> None:
+        """Index ``installations`` from scratch.
+
+        The new dicts are filled off to the side and swapped in, so lock-free
+        readers see either the old or the new lookups but never an emptied one.
+        """
+        bot_tokens: Dict[str, Optional[str]] = {}
+        bot_user_ids: Dict[str, Optional[str]] = {}
+        user_tokens: Dict[str, Optional[str]] = {}
+        for team_id, installation in installations.items():
+            bot_tokens[team_id] = installation.bot_token
+            bot_user_ids[team_id] = installation.bot_user_id
+            user_tokens[team_id] = installation.user_token
+        self._bot_tokens = bot_tokens
+        self._bot_user_ids = bot_user_ids
+        self._user_tokens = user_tokens
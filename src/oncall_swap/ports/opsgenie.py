@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Sequence
+from uuid import UUID
 
 from oncall_swap.domain.models import Participant, TimeWindow
 
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OnCallAssignment:
     participant: Participant
     window: TimeWindow
@@ -19,13 +19,57 @@ class OpsgenieSchedulePort:
     def list_oncall(self, schedule_id: str, start: datetime, end: datetime) -> List[OnCallAssignment]:
         raise NotImplementedError
 
+    def list_oncall_many(
+        self, schedule_ids: Sequence[str], start: datetime, end: datetime
+    ) -> Dict[str, List[OnCallAssignment]]:
+        """List on-call assignments for several schedules; adapters may query them concurrently."""
+        return {schedule_id: self.list_oncall(schedule_id, start, end) for schedule_id in schedule_ids}
+
 
 class OpsgenieOverridePort:
-    """Writes overrides back to Opsgenie."""
+    """Writes overrides back to Opsgenie.
+
+    ``apply_overrides`` is the entry point used by the application: it merges
+    touching windows per participant and hands the result to
+    ``bulk_apply_overrides`` in one call. Adapters with a batch API override
+    ``bulk_apply_overrides``; the default falls back to one ``apply_override``
+    per assignment.
+    """
 
     def apply_override(self, schedule_id: str, participant: Participant, window: TimeWindow) -> None:
         raise NotImplementedError
 
     def apply_overrides(self, schedule_id: str, assignments: Iterable[OnCallAssignment]) -> None:
+        merged = _coalesce(assignments)
+        if merged:
+            self.bulk_apply_overrides(schedule_id, merged)
+
+    def bulk_apply_overrides(self, schedule_id: str, assignments: List[OnCallAssignment]) -> None:
         for assignment in assignments:
             self.apply_override(schedule_id, assignment.participant, assignment.window)
+
+
+def _coalesce(assignments: Iterable[OnCallAssignment]) -> List[OnCallAssignment]:
+    """Merge each participant's overlapping or back-to-back windows into single assignments."""
+    by_participant: Dict[UUID, List[OnCallAssignment]] = {}
+    for assignment in assignments:
+        by_participant.setdefault(assignment.participant.id, []).append(assignment)
+
+    merged: List[OnCallAssignment] = []
+    for group in by_participant.values():
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        group.sort(key=lambda assignment: assignment.window.start)
+        current = group[0]
+        for assignment in group[1:]:
+            if assignment.window.start > current.window.end:
+                merged.append(current)
+                current = assignment
+            elif assignment.window.end > current.window.end:
+                current = OnCallAssignment(
+                    participant=current.participant,
+                    window=TimeWindow(start=current.window.start, end=assignment.window.end),
+                )
+        merged.append(current)
+    return merged
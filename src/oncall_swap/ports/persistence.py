@@ -7,6 +7,8 @@ from oncall_swap.domain.models import SwapOffer
 class OfferRepository:
     """Abstract storage for swap offers."""
 
+    __slots__ = ()
+
     def add(self, offer: SwapOffer) -> None:
         raise NotImplementedError
 
@@ -0,0 +1,53 @@
+"""Domain and application names, plus the schedule fake, shared by the service-level tests and their fixtures."""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from oncall_swap.application.commands import AcceptCoverCommand, CreateOfferCommand, TimeWindowDTO
+from oncall_swap.application.services import SwapNegotiationService
+from oncall_swap.domain.models import OfferStatus, Participant, SwapOffer, TimeWindow
+from oncall_swap.domain.time import Instant
+from oncall_swap.ports.opsgenie import OnCallAssignment, OpsgenieSchedulePort
+
+__all__ = [
+    "AcceptCoverCommand",
+    "CreateOfferCommand",
+    "FakeSchedulePort",
+    "Instant",
+    "OfferStatus",
+    "OnCallAssignment",
+    "Participant",
+    "SwapNegotiationService",
+    "SwapOffer",
+    "TimeWindow",
+    "TimeWindowDTO",
+]
+
+# Schedules larger than this are answered from a start-sorted index instead of a linear scan
+_INDEX_THRESHOLD = 32
+# Returned for empty schedules; callers only iterate the result, so one shared tuple serves every call
+_EMPTY: Tuple[OnCallAssignment, ...] = ()
+
+
+class FakeSchedulePort(OpsgenieSchedulePort):
+    def __init__(self, assignments: List[OnCallAssignment]) -> None:
+        self.assignments = assignments
+        self._by_start: Optional[List[OnCallAssignment]] = None
+        self._starts: List[datetime] = []
+        if len(assignments) > _INDEX_THRESHOLD:
+            self._by_start = sorted(assignments, key=lambda assignment: assignment.window.start)
+            self._starts = [assignment.window.start for assignment in self._by_start]
+
+    def list_oncall(self, schedule_id: str, start: datetime, end: datetime) -> Sequence[OnCallAssignment]:
+        if not self.assignments:
+            return _EMPTY
+        candidates = self.assignments
+        if self._by_start is not None:
+            # Only windows starting within [start, end] can also end by ``end``
+            candidates = self._by_start[bisect_left(self._starts, start) : bisect_right(self._starts, end)]
+        return [
+            assignment
+            for assignment in candidates
+            if assignment.window.start >= start and assignment.window.end <= end
+        ]
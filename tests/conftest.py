@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+import pytest
+
+from _common import FakeSchedulePort, OnCallAssignment, Participant, SwapNegotiationService, SwapOffer, TimeWindow
+from oncall_swap.infrastructure.directory.in_memory import InMemoryParticipantDirectory
+from oncall_swap.infrastructure.persistence.in_memory import InMemoryOfferRepository
+from oncall_swap.ports.opsgenie import OpsgenieOverridePort, OpsgenieSchedulePort
+from oncall_swap.ports.slack import SlackNotificationPort, SlackPromptPort
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+
+class FakeOverridePort(OpsgenieOverridePort):
+    def __init__(self) -> None:
+        self.applied: List[OnCallAssignment] = []
+        self.by_email: Dict[str, OnCallAssignment] = {}
+
+    def apply_override(self, schedule_id: str, participant: Participant, window: TimeWindow) -> None:
+        assignment = OnCallAssignment(participant=participant, window=window)
+        self.applied.append(assignment)
+        self.by_email[participant.email] = assignment
+
+
+@dataclass(frozen=True, slots=True)
+class DirectSwapRecord:
+    participant: Participant
+    window: TimeWindow
+
+
+class DummySlack(SlackNotificationPort, SlackPromptPort):
+    def __init__(self) -> None:
+        self.announce_count: int = 0
+        self.last_announcement: Optional[SwapOffer] = None
+        self.prompt_requests: List[tuple[UUID, List[str], str]] = []
+        self.direct_swaps: List[DirectSwapRecord] = []
+        self.ring_completions: int = 0
+        self.last_direct_swap_assignments: List[OnCallAssignment] = []
+
+    def announce_offer(self, offer: SwapOffer) -> None:
+        self.announce_count += 1
+        self.last_announcement = offer
+
+    def notify_direct_swap(
+        self,
+        offer: SwapOffer,
+        participant: Participant,
+        window: TimeWindow,
+        all_assignments: Optional[List[OnCallAssignment]] = None,
+    ) -> None:
+        self.direct_swaps.append(DirectSwapRecord(participant=participant, window=window))
+        if all_assignments:
+            self.last_direct_swap_assignments = all_assignments
+
+    def notify_ring_candidate(self, offer: SwapOffer, candidate: Participant) -> None:
+        pass
+
+    def notify_ring_completion(self, offer: SwapOffer) -> None:
+        self.ring_completions += 1
+
+    def notify_ring_update(self, offer: SwapOffer) -> None:
+        pass
+
+    def prompt_cover_request(
+        self,
+        offer_id: UUID,
+        candidates: Iterable[Participant],
+        window: TimeWindow,
+        available_alternatives: Iterable[TimeWindow],
+        need_owner: Participant,
+    ) -> None:
+        self.prompt_requests.append((offer_id, [c.email for c in candidates], need_owner.email))
+
+
+@pytest.fixture(scope="session")
+def participants() -> Dict[str, Participant]:
+    """Stock participants p1..p4, keyed by email and shared by every test."""
+    return {f"p{index}@example.com": Participant(email=f"p{index}@example.com") for index in range(1, 5)}
+
+
+def _upsert_all(
+    directory: InMemoryParticipantDirectory, participants: Iterable[Participant]
+) -> Dict[str, Participant]:
+    """Upsert ``participants`` in one pass, returning the stored participants by email."""
+    return {participant.email: directory.upsert(participant) for participant in participants}
+
+
+@pytest.fixture
+def directory(participants: Dict[str, Participant]) -> InMemoryParticipantDirectory:
+    directory = InMemoryParticipantDirectory()
+    _upsert_all(directory, participants.values())
+    return directory
+
+
+@pytest.fixture
+def repository() -> InMemoryOfferRepository:
+    return InMemoryOfferRepository()
+
+
+@pytest.fixture
+def slack() -> DummySlack:
+    return DummySlack()
+
+
+@pytest.fixture
+def override_port() -> FakeOverridePort:
+    return FakeOverridePort()
+
+
+@pytest.fixture
+def schedule_port(request: pytest.FixtureRequest) -> FakeSchedulePort:
+    """Fake schedule over ``request.param``; parametrize it indirectly to supply assignments."""
+    return FakeSchedulePort(list(getattr(request, "param", ())))
+
+
+@pytest.fixture
+def service_factory(
+    directory: InMemoryParticipantDirectory,
+    repository: InMemoryOfferRepository,
+    slack: DummySlack,
+    override_port: FakeOverridePort,
+    schedule_port: FakeSchedulePort,
+) -> Callable[..., SwapNegotiationService]:
+    """Build a service over the per-test fakes.
+
+    The schedule comes from, in order: a prebuilt ``schedule_port`` argument,
+    explicit ``assignments``, or the (possibly parametrized) ``schedule_port`` fixture.
+    """
+    default_port = schedule_port
+
+    def build(
+        assignments: Iterable[OnCallAssignment] = (),
+        schedule_port: Optional[OpsgenieSchedulePort] = None,
+    ) -> SwapNegotiationService:
+        if schedule_port is None:
+            assignments = list(assignments)
+            schedule_port = FakeSchedulePort(assignments) if assignments else default_port
+        return SwapNegotiationService(
+            repository=repository,
+            directory=directory,
+            schedule_port=schedule_port,
+            override_port=override_port,
+            slack_notifications=slack,
+            slack_prompts=slack,
+        )
+
+    return build
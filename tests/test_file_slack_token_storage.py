@@ -0,0 +1,280 @@
+import gc
+import json
+import weakref
+
+import pytest
+from slack_sdk.oauth.installation_store import Installation
+
+from oncall_swap.infrastructure.slack_tokens import FileSlackTokenStorage
+
+
+def _installation(team_id: str, **extra) -> Installation:
+    fields = {
+        "bot_token": f"xoxb-{team_id}",
+        "bot_id": f"B-{team_id}",
+        "bot_user_id": f"U-{team_id}",
+        "user_id": f"W-{team_id}",
+        **extra,
+    }
+    return Installation(team_id=team_id, **fields)
+
+
+def test_mutations_are_coalesced_until_flush(tmp_path):
+    path = tmp_path / "tokens.json"
+    storage = FileSlackTokenStorage(path)
+    try:
+        storage.save(_installation("T1"))
+        storage.save(_installation("T2"))
+        storage.remove_installation("T1")
+
+        storage.flush()
+
+        entries = [json.loads(line) for line in storage.log_path.read_text().splitlines()]
+        assert [(e["op"], e["team_id"]) for e in entries] == [("delete", "T1"), ("upsert", "T2")]
+    finally:
+        storage.close()
+
+    reloaded = FileSlackTokenStorage(path)
+    try:
+        assert reloaded.find_installation(team_id="T1") is None
+        assert reloaded.get_bot_token("T2") == "xoxb-T2"
+    finally:
+        reloaded.close()
+
+
+def test_flushed_installations_reload_from_disk(tmp_path):
+    path = tmp_path / "tokens.json"
+    storage = FileSlackTokenStorage(path)
+    storage.save(_installation("T1", user_token="xoxp-T1"))
+    storage.close()
+
+    reloaded = FileSlackTokenStorage(path)
+    try:
+        assert reloaded.get_bot_token("T1") == "xoxb-T1"
+        assert reloaded.get_bot_user_id("T1") == "U-T1"
+        assert reloaded.get_access_token("T1") == "xoxp-T1"
+    finally:
+        reloaded.close()
+
+
+@pytest.mark.parametrize("durable", [False, True])
+def test_log_compacts_into_snapshot(tmp_path, durable):
+    path = tmp_path / "tokens.json"
+    storage = FileSlackTokenStorage(path, durable=durable)
+    for rotation in range(10):
+        storage.save(_installation("T1", bot_token=f"xoxb-{rotation}"))
+        storage.flush()
+    storage.close()
+
+    snapshot = json.loads(path.read_text())
+    assert snapshot["version"] == 10
+    assert snapshot["teams"]["T1"]["bot_token"] == "xoxb-9"
+    assert not storage.log_path.exists()
+    assert not path.with_suffix(".json.tmp").exists()
+
+    reloaded = FileSlackTokenStorage(path, durable=durable)
+    try:
+        assert reloaded.get_bot_token("T1") == "xoxb-9"
+    finally:
+        reloaded.close()
+
+
+def test_log_left_behind_by_interrupted_compaction_is_not_replayed(tmp_path):
+    path = tmp_path / "tokens.json"
+    storage = FileSlackTokenStorage(path)
+    for rotation in range(9):
+        storage.save(_installation("T1", bot_token=f"old-{rotation}"))
+        storage.flush()
+    log_before = storage.log_path.read_bytes()
+    version_before = storage.version_path.read_bytes()
+
+    storage.remove_installation("T1")
+    storage.close()
+    assert not storage.log_path.exists()
+
+    # The process died after writing the snapshot, before removing the log and bumping the version
+    storage.log_path.write_bytes(log_before)
+    storage.version_path.write_bytes(version_before)
+
+    restarted = FileSlackTokenStorage(path)
+    try:
+        assert restarted.get_bot_token("T1") is None
+    finally:
+        restarted.close()
+
+
+def test_torn_log_line_is_skipped(tmp_path):
+    path = tmp_path / "tokens.json"
+    storage = FileSlackTokenStorage(path)
+    storage.save(_installation("T1"))
+    storage.close()
+    with open(storage.log_path, "ab") as f:
+        f.write(b'{"op":"upsert","team_id":"T2","ins')
+
+    reloaded = FileSlackTokenStorage(path)
+    try:
+        assert reloaded.get_bot_token("T1") == "xoxb-T1"
+        assert reloaded.find_installation(team_id="T2") is None
+        reloaded.save(_installation("T3"))
+    finally:
+        reloaded.close()
+
+    assert FileSlackTokenStorage(path).get_bot_token("T3") == "xoxb-T3"
+
+
+def test_token_lookups_follow_writes(tmp_path):
+    storage = FileSlackTokenStorage(tmp_path / "tokens.json")
+    try:
+        assert storage.get_bot_token("T1") is None
+
+        storage.save(_installation("T1"))
+        assert storage.get_bot_token("T1") == "xoxb-T1"
+
+        storage.save(_installation("T1", bot_token="xoxb-rotated"))
+        assert storage.get_bot_token("T1") == "xoxb-rotated"
+
+        storage.delete_installation(team_id="T1")
+        assert storage.get_bot_token("T1") is None
+    finally:
+        storage.close()
+
+
+def test_pretty_snapshot_is_indented(tmp_path):
+    path = tmp_path / "tokens.json"
+    storage = FileSlackTokenStorage(path, pretty=True)
+    storage.save(_installation("T1"))
+    storage._compact(storage._installations)
+    storage.close()
+
+    assert '\n  "teams": {\n    "T1": {' in path.read_text()
+
+
+def test_reads_pick_up_flushes_from_another_instance(tmp_path):
+    path = tmp_path / "tokens.json"
+    writer = FileSlackTokenStorage(path)
+    reader = FileSlackTokenStorage(path)
+    try:
+        assert reader.get_bot_token("T1") is None
+
+        writer.save(_installation("T1"))
+        writer.flush()
+        assert reader.get_bot_token("T1") == "xoxb-T1"
+
+        writer.remove_installation("T1")
+        writer.flush()
+        assert reader.find_installation(team_id="T1") is None
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_reload_swaps_in_new_lookups(tmp_path):
+    path = tmp_path / "tokens.json"
+    writer = FileSlackTokenStorage(path)
+    writer.save(_installation("T1"))
+    writer.flush()
+    reader = FileSlackTokenStorage(path)
+    try:
+        # A getter that read the lookup just before a reload keeps a complete view
+        lookup = reader._bot_tokens
+        writer.save(_installation("T2"))
+        writer.flush()
+        assert reader.get_bot_token("T2") == "xoxb-T2"
+        assert lookup == {"T1": "xoxb-T1"}
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_legacy_flat_snapshot_still_loads(tmp_path):
+    path = tmp_path / "tokens.json"
+    path.write_text(json.dumps({"T1": {"team_id": "T1", "bot_token": "xoxb-T1", "bot_id": "B", "bot_user_id": "U", "user_id": "W"}}))
+
+    storage = FileSlackTokenStorage(path)
+    try:
+        assert storage.get_bot_token("T1") == "xoxb-T1"
+    finally:
+        storage.close()
+
+
+def test_flush_builds_on_another_instances_flush(tmp_path):
+    path = tmp_path / "tokens.json"
+    a = FileSlackTokenStorage(path)
+    b = FileSlackTokenStorage(path)
+    try:
+        b.save(_installation("TB"))
+        b.flush()
+        a.save(_installation("TA"))
+        a.flush()
+        assert a.get_bot_token("TB") == "xoxb-TB"
+
+        # Enough rotations to make A compact its view into the snapshot
+        for rotation in range(20):
+            a.save(_installation("TA", bot_token=f"xoxb-{rotation}"))
+            a.flush()
+        assert path.exists()
+    finally:
+        a.close()
+        b.close()
+
+    fresh = FileSlackTokenStorage(path)
+    try:
+        assert fresh.get_bot_token("TB") == "xoxb-TB"
+        assert fresh.get_bot_token("TA") == "xoxb-19"
+    finally:
+        fresh.close()
+
+
+def test_reload_leaves_files_untouched(tmp_path):
+    path = tmp_path / "tokens.json"
+    writer = FileSlackTokenStorage(path)
+    writer.save(_installation("T1"))
+    writer.flush()
+    reader = FileSlackTokenStorage(path)
+    try:
+        # Another process bumps the version while its append is still incomplete
+        with open(writer.log_path, "ab") as f:
+            f.write(b'{"op":"upsert","team_id":"T2","ins')
+        writer.version_path.write_text("99")
+        log_before = writer.log_path.read_bytes()
+
+        assert reader.get_bot_token("T1") == "xoxb-T1"
+        assert reader.find_installation(team_id="T2") is None
+        assert writer.log_path.read_bytes() == log_before
+        assert not path.exists()
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_failed_flush_is_retried_with_backoff_and_logged_once(tmp_path, monkeypatch, caplog):
+    storage = FileSlackTokenStorage(tmp_path / "tokens.json")
+    try:
+        def failing_append(pending):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(storage, "_append_to_log", failing_append)
+        storage.save(_installation("T1"))
+        delays = []
+        for _ in range(3):
+            with pytest.raises(OSError):
+                storage.flush()
+            assert storage._dirty
+            delays.append(storage._flush_timer.interval)
+        assert delays == sorted(delays) and delays[0] < delays[-1]
+        assert len([r for r in caplog.records if r.levelname == "WARNING"]) == 1
+
+        monkeypatch.undo()
+        storage.flush()
+        assert storage.log_path.exists()
+        assert storage._flush_failures == 0
+    finally:
+        storage.close()
+
+
+def test_unclosed_storage_can_be_collected(tmp_path):
+    storage = FileSlackTokenStorage(tmp_path / "tokens.json")
+    ref = weakref.ref(storage)
+    del storage
+    gc.collect()
+    assert ref() is None
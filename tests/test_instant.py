@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from oncall_swap.domain.time import Instant
 
@@ -15,3 +15,14 @@ def test_instant_converts_aware_datetime_to_utc():
     instant = Instant(at=aware)
     assert instant.to_datetime().tzinfo == timezone.utc
     assert instant.to_datetime() == aware.astimezone(timezone.utc)
+
+
+def test_instant_converts_offset_datetime_to_utc():
+    offset = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=2)))
+    instant = Instant(at=offset)
+    assert instant.to_datetime().tzinfo is timezone.utc
+    assert instant.to_datetime().hour == 10
+
+
+def test_utc_now_is_utc():
+    assert Instant.utc_now().to_datetime().tzinfo is timezone.utc
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import pytest
+
+from oncall_swap.adapters.opsgenie.threaded import ThreadedOpsgenieMixin
+from oncall_swap.domain.models import Participant, TimeWindow
+from oncall_swap.ports.opsgenie import OnCallAssignment, OpsgenieOverridePort, OpsgenieSchedulePort
+
+
+class RecordingOverridePort(OpsgenieOverridePort):
+    def __init__(self) -> None:
+        self.batches: List[Tuple[str, List[OnCallAssignment]]] = []
+
+    def bulk_apply_overrides(self, schedule_id: str, assignments: List[OnCallAssignment]) -> None:
+        self.batches.append((schedule_id, assignments))
+
+
+class ThreadedRecordingPort(ThreadedOpsgenieMixin, OpsgenieOverridePort):
+    def __init__(self, failing_email: str = "") -> None:
+        self.applied: List[OnCallAssignment] = []
+        self.failing_email = failing_email
+
+    def apply_override(self, schedule_id: str, participant: Participant, window: TimeWindow) -> None:
+        if participant.email == self.failing_email:
+            raise ConnectionError("override rejected")
+        self.applied.append(OnCallAssignment(participant=participant, window=window))
+
+
+class StaticSchedulePort(ThreadedOpsgenieMixin, OpsgenieSchedulePort):
+    def __init__(self, by_schedule: Dict[str, List[OnCallAssignment]]) -> None:
+        self.by_schedule = by_schedule
+
+    def list_oncall(self, schedule_id: str, start: datetime, end: datetime) -> List[OnCallAssignment]:
+        return self.by_schedule[schedule_id]
+
+
+def _window(day: int, hours: int = 24) -> TimeWindow:
+    start = datetime(2025, 11, day, 9, tzinfo=timezone.utc)
+    return TimeWindow(start=start, end=start + timedelta(hours=hours))
+
+
+def test_apply_overrides_merges_touching_windows_per_participant():
+    p1 = Participant(email="p1@example.com")
+    p2 = Participant(email="p2@example.com")
+    port = RecordingOverridePort()
+
+    port.apply_overrides(
+        "primary",
+        [
+            OnCallAssignment(participant=p1, window=_window(11)),
+            OnCallAssignment(participant=p2, window=_window(10)),
+            OnCallAssignment(participant=p1, window=_window(10)),
+            OnCallAssignment(participant=p1, window=_window(14)),
+        ],
+    )
+
+    [(schedule_id, applied)] = port.batches
+    assert schedule_id == "primary"
+    assert [(a.participant.email, a.window.start.day, a.window.end.day) for a in applied] == [
+        ("p1@example.com", 10, 12),
+        ("p1@example.com", 14, 15),
+        ("p2@example.com", 10, 11),
+    ]
+
+
+def test_apply_overrides_skips_empty_batches():
+    port = RecordingOverridePort()
+    port.apply_overrides("primary", [])
+    assert port.batches == []
+
+
+def test_threaded_port_applies_every_override_and_surfaces_failures():
+    participants = [Participant(email=f"p{index}@example.com") for index in range(1, 4)]
+    assignments = [
+        OnCallAssignment(participant=participant, window=_window(10 + index))
+        for index, participant in enumerate(participants)
+    ]
+
+    port = ThreadedRecordingPort()
+    port.apply_overrides("primary", assignments)
+    assert sorted(a.participant.email for a in port.applied) == [p.email for p in participants]
+
+    failing = ThreadedRecordingPort(failing_email="p2@example.com")
+    with pytest.raises(ConnectionError):
+        failing.apply_overrides("primary", assignments)
+    assert len(failing.applied) == 2
+
+
+def test_list_oncall_many_returns_each_schedule():
+    p1 = Participant(email="p1@example.com")
+    by_schedule = {
+        "primary": [OnCallAssignment(participant=p1, window=_window(10))],
+        "secondary": [],
+    }
+    port = StaticSchedulePort(by_schedule)
+
+    window = _window(10)
+    assert port.list_oncall_many(["primary", "secondary"], window.start, window.end) == by_schedule
@@ -1,292 +1,194 @@
-from datetime import datetime, timedelta, timezone
-from typing import Iterable, List, Optional
-from uuid import UUID
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Tuple
 
 import pytest
 
-from oncall_swap.application.commands import AcceptCoverCommand, CreateOfferCommand, TimeWindowDTO
-from oncall_swap.application.services import SwapNegotiationService
-from oncall_swap.domain.models import Participant, SwapOffer, TimeWindow
-from oncall_swap.domain.time import Instant
-from oncall_swap.infrastructure.directory.in_memory import InMemoryParticipantDirectory
-from oncall_swap.infrastructure.persistence.in_memory import InMemoryOfferRepository
-from oncall_swap.ports.opsgenie import OnCallAssignment, OpsgenieOverridePort, OpsgenieSchedulePort
-from oncall_swap.ports.slack import SlackNotificationPort, SlackPromptPort
+from _common import (
+    AcceptCoverCommand,
+    CreateOfferCommand,
+    FakeSchedulePort,
+    Instant,
+    OfferStatus,
+    OnCallAssignment,
+    SwapOffer,
+    TimeWindow,
+    TimeWindowDTO,
+)
 
 # Fixed test instant: Nov 10, 2025 at 8:00 AM UTC
 TEST_NOW = Instant(at=datetime(2025, 11, 10, 8, 0, 0, tzinfo=timezone.utc))
 
 
-class FakeSchedulePort(OpsgenieSchedulePort):
-    def __init__(self, assignments: List[OnCallAssignment]) -> None:
-        self.assignments = assignments
-
-    def list_oncall(self, schedule_id: str, start: datetime, end: datetime) -> List[OnCallAssignment]:
-        return self.assignments
-
-
-class FakeOverridePort(OpsgenieOverridePort):
-    def __init__(self) -> None:
-        self.applied: List[OnCallAssignment] = []
-
-    def apply_override(self, schedule_id: str, participant: Participant, window: TimeWindow) -> None:
-        self.applied.append(OnCallAssignment(participant=participant, window=window))
-
-
-class DummySlack(SlackNotificationPort, SlackPromptPort):
-    def __init__(self) -> None:
-        self.announcements: List[SwapOffer] = []
-        self.prompt_requests: List[tuple[UUID, List[str], str]] = []
-        self.direct_swaps: List[tuple[Participant, TimeWindow]] = []
-        self.ring_completions: int = 0
-        self.last_direct_swap_assignments: List[OnCallAssignment] = []
-
-    def announce_offer(self, offer: SwapOffer) -> None:
-        self.announcements.append(offer)
-
-    def notify_direct_swap(
-        self,
-        offer: SwapOffer,
-        participant: Participant,
-        window: TimeWindow,
-        all_assignments: Optional[List[OnCallAssignment]] = None,
-    ) -> None:
-        self.direct_swaps.append((participant, window))
-        if all_assignments:
-            self.last_direct_swap_assignments = all_assignments
-
-    def notify_ring_candidate(self, offer: SwapOffer, candidate: Participant) -> None:
-        pass
-
-    def notify_ring_completion(self, offer: SwapOffer) -> None:
-        self.ring_completions += 1
-
-    def notify_ring_update(self, offer: SwapOffer) -> None:
-        pass
-
-    def prompt_cover_request(
-        self,
-        offer_id: UUID,
-        candidates: Iterable[Participant],
-        window: TimeWindow,
-        available_alternatives: Iterable[TimeWindow],
-        need_owner: Participant,
-    ) -> None:
-        self.prompt_requests.append((offer_id, [c.email for c in candidates], need_owner.email))
+# Fixed base date: Nov 10, 2025 at 9:00 AM UTC; every day offset the tests use, built once
+_BASE = datetime(2025, 11, 10, 9, 0, 0, tzinfo=timezone.utc)
+_TWELVE_HOURS = timedelta(hours=12)
+_DAY_DELTAS = tuple(timedelta(days=day) for day in range(15))
+WINDOWS = {
+    day: TimeWindowDTO(start=_BASE + _DAY_DELTAS[day], end=_BASE + _DAY_DELTAS[day] + _TWELVE_HOURS)
+    for day in (0, 1, 2, 3, 4, 9, 14)
+}
 
 
 def make_window(day_offset: int) -> TimeWindowDTO:
-    # Use fixed base date: Nov 10, 2025 at 9:00 AM UTC
-    base = datetime(2025, 11, 10, 9, 0, 0, tzinfo=timezone.utc)
-    start = base + timedelta(days=day_offset)
-    end = start + timedelta(hours=12)
-    return TimeWindowDTO(start=start, end=end)
-
-
-def dto_to_window(dto: TimeWindowDTO) -> TimeWindow:
-    return TimeWindow(start=dto.start, end=dto.end)
+    return WINDOWS[day_offset]
 
 
-def test_ring_swap_resolution():
-    directory = InMemoryParticipantDirectory()
-    repository = InMemoryOfferRepository()
-    slack = DummySlack()
-    override_port = FakeOverridePort()
+@lru_cache(maxsize=None)
+def _shared_window(start: datetime, end: datetime) -> TimeWindow:
+    return TimeWindow(start=start, end=end)
 
-    # Participants
-    requester = directory.upsert(Participant(email="p1@example.com"))
-    p3 = directory.upsert(Participant(email="p3@example.com"))
-    p4 = directory.upsert(Participant(email="p4@example.com"))
-
-    let_window = make_window(0)
-    search_window = make_window(3)  # T3
-    ring_window = make_window(14)  # T14
-
-    schedule_port = FakeSchedulePort(
-        assignments=[
-            OnCallAssignment(participant=p4, window=dto_to_window(search_window)),
-            OnCallAssignment(participant=p3, window=dto_to_window(ring_window)),
-        ]
-    )
-
-    service = SwapNegotiationService(
-        repository=repository,
-        directory=directory,
-        schedule_port=schedule_port,
-        override_port=override_port,
-        slack_notifications=slack,
-        slack_prompts=slack,
-    )
-
-    command = CreateOfferCommand(
-        requester_email=requester.email,
-        schedule_id="primary",
-        let_window=let_window,
-        search_windows=[search_window],
-    )
-
-    offer = service.create_offer(command, now=TEST_NOW)
-
-    # P3 covers let window, needs T14.
-    service.accept_cover(
-        AcceptCoverCommand(
-            offer_id=offer.id,
-            participant_email=p3.email,
-            covers_window=let_window,
-            needs_windows=[ring_window],
-        )
-    )
 
-    # P4 covers T14, wants T3 (search window).
-    ring_result = service.accept_cover(
-        AcceptCoverCommand(
-            offer_id=offer.id,
-            participant_email=p4.email,
-            covers_window=ring_window,
-            needs_windows=[search_window],
+def dto_to_window(dto: TimeWindowDTO) -> TimeWindow:
+    return _shared_window(dto.start, dto.end)
+
+
+def _dates(window: TimeWindow) -> Tuple[date, date]:
+    return window.start.date(), window.end.date()
+
+
+@dataclass(frozen=True)
+class Cover:
+    """A participant covering one window in exchange for another (day offsets from make_window)."""
+
+    email: str
+    covers: int
+    needs: int
+
+
+@dataclass(frozen=True)
+class RingScenario:
+    """P1 offers day 0 for ``search_day``; two participants then respond in turn."""
+
+    id: str
+    assignments: Tuple[Tuple[str, int], ...]
+    search_day: int
+    first_cover: Cover
+    second_cover: Cover
+    expected_result_none: bool
+    expected_direct_swaps: int = 1
+    expected_ring_completions: int = 0
+
+
+RING_SCENARIOS = [
+    # P3 covers the let window and needs T14; P4 covers T14 for the search window, closing the ring.
+    RingScenario(
+        id="ring_closed_by_search_window",
+        assignments=(("p4@example.com", 3), ("p3@example.com", 14)),
+        search_day=3,
+        first_cover=Cover("p3@example.com", covers=0, needs=14),
+        second_cover=Cover("p4@example.com", covers=14, needs=3),
+        expected_result_none=True,
+    ),
+    # Same shape with a helper also on the search window.
+    RingScenario(
+        id="ring_and_direct_swap",
+        assignments=(("p2@example.com", 4), ("p3@example.com", 2), ("p4@example.com", 4)),
+        search_day=4,
+        first_cover=Cover("p3@example.com", covers=0, needs=2),
+        second_cover=Cover("p4@example.com", covers=2, needs=4),
+        expected_result_none=True,
+    ),
+    # Before the ring need is satisfied, a direct swapper takes the let window.
+    RingScenario(
+        id="ring_candidate_then_direct_swap",
+        assignments=(("p2@example.com", 4), ("p3@example.com", 2)),
+        search_day=4,
+        first_cover=Cover("p3@example.com", covers=0, needs=2),
+        second_cover=Cover("p2@example.com", covers=0, needs=4),
+        expected_result_none=False,
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def schedule_ports(participants):
+    """One schedule per scenario id; the fake port never mutates its assignments, so tests can share it."""
+    return {
+        scenario.id: FakeSchedulePort(
+            [
+                OnCallAssignment(participant=participants[email], window=dto_to_window(make_window(day)))
+                for email, day in scenario.assignments
+            ]
         )
-    )
-
-    # Direct swap closing ring swap chain returns None
-    assert ring_result is None
-    assert override_port.applied  # overrides applied
-    assert len(slack.direct_swaps) == 1  # Direct swap notification
+        for scenario in RING_SCENARIOS
+    }
 
 
-def test_ring_and_direct_swap_resolution():
-    directory = InMemoryParticipantDirectory()
-    repository = InMemoryOfferRepository()
-    slack = DummySlack()
-    override_port = FakeOverridePort()
+@pytest.mark.parametrize("scenario", RING_SCENARIOS, ids=lambda scenario: scenario.id)
+def test_ring_scenarios(scenario, participants, slack, override_port, service_factory, schedule_ports):
+    requester = participants["p1@example.com"]
+    service = service_factory(schedule_port=schedule_ports[scenario.id])
 
-    requester = directory.upsert(Participant(email="p1@example.com"))
-    ring_participant = directory.upsert(Participant(email="p3@example.com"))
-    direct_participant = directory.upsert(Participant(email="p4@example.com"))
-    helper_participant = directory.upsert(Participant(email="p2@example.com"))
-
-    let_window = make_window(0)  # T1
-    direct_trade = make_window(4)  # T5
-    ring_need_window = make_window(2)  # T3
-
-    # Schedule: helper on T5 (search), ring participant on T3, direct participant on T5 (search)
-    schedule_port = FakeSchedulePort(
-        assignments=[
-            OnCallAssignment(participant=helper_participant, window=dto_to_window(direct_trade)),
-            OnCallAssignment(participant=ring_participant, window=dto_to_window(ring_need_window)),
-            OnCallAssignment(participant=direct_participant, window=dto_to_window(direct_trade)),
-        ]
-    )
-
-    service = SwapNegotiationService(
-        repository=repository,
-        directory=directory,
-        schedule_port=schedule_port,
-        override_port=override_port,
-        slack_notifications=slack,
-        slack_prompts=slack,
-    )
-
-    command = CreateOfferCommand(
-        requester_email=requester.email,
-        schedule_id="primary",
-        let_window=let_window,
-        search_windows=[direct_trade],
-    )
-
-    offer = service.create_offer(command, now=TEST_NOW)
-
-    # Ring participant covers let window, needs T3.
-    service.accept_cover(
-        AcceptCoverCommand(
-            offer_id=offer.id,
-            participant_email=ring_participant.email,
-            covers_window=let_window,
-            needs_windows=[ring_need_window],
-        )
+    offer = service.create_offer(
+        CreateOfferCommand(
+            requester_email=requester.email,
+            schedule_id="primary",
+            let_window=make_window(0),
+            search_windows=[make_window(scenario.search_day)],
+        ),
+        now=TEST_NOW,
     )
 
-    # Search participant covers T3 (new need), wants initial search window.
-    ring_result = service.accept_cover(
-        AcceptCoverCommand(
-            offer_id=offer.id,
-            participant_email=direct_participant.email,
-            covers_window=ring_need_window,
-            needs_windows=[direct_trade],
+    result = None
+    for cover in (scenario.first_cover, scenario.second_cover):
+        result = service.accept_cover(
+            AcceptCoverCommand(
+                offer_id=offer.id,
+                participant_email=cover.email,
+                covers_window=make_window(cover.covers),
+                needs_windows=[make_window(cover.needs)],
+            )
         )
-    )
-
-    # Direct swap closing ring swap chain returns None
-    assert ring_result is None
-    assert len(slack.direct_swaps) == 1  # Direct swap notification
 
+    assert (result is None) == scenario.expected_result_none
+    assert override_port.applied
+    assert len(slack.direct_swaps) == scenario.expected_direct_swaps
+    assert slack.direct_swaps[-1].participant.email == scenario.second_cover.email
+    assert slack.ring_completions == scenario.expected_ring_completions
 
-def test_ring_candidate_then_direct_swap_closes_offer():
-    directory = InMemoryParticipantDirectory()
-    repository = InMemoryOfferRepository()
-    slack = DummySlack()
-    override_port = FakeOverridePort()
-
-    requester = directory.upsert(Participant(email="p1@example.com"))
-    ring_participant = directory.upsert(Participant(email="p3@example.com"))
-    direct_participant = directory.upsert(Participant(email="p2@example.com"))
-
-    let_window = make_window(0)  # T1
-    search_window = make_window(4)  # T5
-    ring_need_window = make_window(2)  # T3
-
-    schedule_port = FakeSchedulePort(
-        assignments=[
-            OnCallAssignment(participant=direct_participant, window=dto_to_window(search_window)),
-            OnCallAssignment(participant=ring_participant, window=dto_to_window(ring_need_window)),
-        ]
-    )
-
-    service = SwapNegotiationService(
-        repository=repository,
-        directory=directory,
-        schedule_port=schedule_port,
-        override_port=override_port,
-        slack_notifications=slack,
-        slack_prompts=slack,
-    )
 
+def test_failed_ring_closure_overrides_leave_offer_open(
+    participants, override_port, service_factory, schedule_ports, monkeypatch
+):
+    scenario = RING_SCENARIOS[0]
+    service = service_factory(schedule_port=schedule_ports[scenario.id])
     offer = service.create_offer(
         CreateOfferCommand(
-            requester_email=requester.email,
+            requester_email="p1@example.com",
             schedule_id="primary",
-            let_window=let_window,
-            search_windows=[search_window],
+            let_window=make_window(0),
+            search_windows=[make_window(scenario.search_day)],
         ),
         now=TEST_NOW,
     )
-
-    # Ring participant volunteers first and asks for coverage.
-    service.accept_cover(
+    commands = [
         AcceptCoverCommand(
             offer_id=offer.id,
-            participant_email=ring_participant.email,
-            covers_window=let_window,
-            needs_windows=[ring_need_window],
+            participant_email=cover.email,
+            covers_window=make_window(cover.covers),
+            needs_windows=[make_window(cover.needs)],
         )
-    )
+        for cover in (scenario.first_cover, scenario.second_cover)
+    ]
+    service.accept_cover(commands[0])
 
-    # Before the ring need is satisfied, a direct swapper takes the let window.
-    direct_result = service.accept_cover(
-        AcceptCoverCommand(
-            offer_id=offer.id,
-            participant_email=direct_participant.email,
-            covers_window=let_window,
-            needs_windows=[search_window],
-        )
-    )
+    def failing_apply_overrides(schedule_id, assignments):
+        raise ConnectionError("opsgenie unavailable")
+
+    monkeypatch.setattr(override_port, "apply_overrides", failing_apply_overrides)
+    with pytest.raises(ConnectionError):
+        service.accept_cover(commands[1])
+    assert service.get_offer(offer.id).status is OfferStatus.ACTIVE
 
-    assert direct_result is not None
-    notified_participant, _ = slack.direct_swaps[-1]
-    assert notified_participant.email == direct_participant.email
-    assert slack.ring_completions == 0
+    monkeypatch.undo()
+    service.accept_cover(commands[1])
+    assert service.get_offer(offer.id).status is OfferStatus.FULFILLED
+    assert override_port.applied
 
 
-def test_ring_swap_then_direct_swap_to_let_window():
+def test_ring_swap_then_direct_swap_to_let_window(participants, slack, override_port, service_factory):
     """
     Test scenario:
     - P1 offers: let_window = T1, search_windows = [T5]
@@ -298,29 +200,21 @@ def test_ring_swap_then_direct_swap_to_let_window():
     - Simple direct swap: P3 covers T1, P1 covers T5
     - Notification should show P3 as the participant
     """
-    directory = InMemoryParticipantDirectory()
-    repository = InMemoryOfferRepository()
-    slack = DummySlack()
-    override_port = FakeOverridePort()
 
-    p1 = directory.upsert(Participant(email="p1@example.com"))
-    p2 = directory.upsert(Participant(email="p2@example.com"))
-    p3 = directory.upsert(Participant(email="p3@example.com"))
+    p1 = participants["p1@example.com"]
+    p2 = participants["p2@example.com"]
+    p3 = participants["p3@example.com"]
 
     let_window = make_window(0)  # T1
     search_window = make_window(4)  # T5
     ring_need_window = make_window(9)  # T10 (outside search_windows)
 
-    schedule_port = FakeSchedulePort(assignments=[])
+    # Offers store domain windows, so compare calendar dates against the DTOs
+    let_dates = _dates(dto_to_window(let_window))
+    search_dates = _dates(dto_to_window(search_window))
+    ring_dates = _dates(dto_to_window(ring_need_window))
 
-    service = SwapNegotiationService(
-        repository=repository,
-        directory=directory,
-        schedule_port=schedule_port,
-        override_port=override_port,
-        slack_notifications=slack,
-        slack_prompts=slack,
-    )
+    service = service_factory()
 
     # P1 creates offer
     offer = service.create_offer(
@@ -347,14 +241,10 @@ def test_ring_swap_then_direct_swap_to_let_window():
     offer = service.get_offer(offer.id)
     assert len(offer.partial_commitments) == 1
     assert offer.partial_commitments[0].from_participant.email == p2.email
-    # Compare dates since let_window is a DTO
-    commitment_window = offer.partial_commitments[0].window
-    assert commitment_window.start.date() == dto_to_window(let_window).start.date()
-    assert commitment_window.end.date() == dto_to_window(let_window).end.date()
+    assert _dates(offer.partial_commitments[0].window) == let_dates
     assert len(offer.outstanding_needs) == 1
     assert offer.outstanding_needs[0].owner.email == p2.email
-    assert offer.outstanding_needs[0].window.start.date() == dto_to_window(ring_need_window).start.date()
-    assert offer.outstanding_needs[0].window.end.date() == dto_to_window(ring_need_window).end.date()
+    assert _dates(offer.outstanding_needs[0].window) == ring_dates
 
     # P3 makes direct swap: covers T1, needs T5
     direct_result = service.accept_cover(
@@ -368,93 +258,97 @@ def test_ring_swap_then_direct_swap_to_let_window():
 
     # Verify offer is fulfilled
     offer = service.get_offer(offer.id)
-    assert offer.status.value == "fulfilled"
+    assert offer.status is OfferStatus.FULFILLED
     assert len(offer.outstanding_needs) == 0
     assert len(offer.partial_commitments) == 0  # P2's commitment should be cancelled
 
     # Verify overrides were applied correctly - should be simple 2-way swap
     assert len(override_port.applied) == 2
     
-    # Find assignments
-    p3_assignment = next(a for a in override_port.applied if a.participant.email == p3.email)
-    p1_assignment = next(a for a in override_port.applied if a.participant.email == p1.email)
+    p3_assignment = override_port.by_email[p3.email]
+    p1_assignment = override_port.by_email[p1.email]
 
     # P3 should cover let_window (T1)
-    assert p3_assignment.window.start.date() == dto_to_window(let_window).start.date()
-    assert p3_assignment.window.end.date() == dto_to_window(let_window).end.date()
+    assert _dates(p3_assignment.window) == let_dates
     
     # P1 should cover what P3 needs (T5)
-    assert p1_assignment.window.start.date() == dto_to_window(search_window).start.date()
-    assert p1_assignment.window.end.date() == dto_to_window(search_window).end.date()
+    assert _dates(p1_assignment.window) == search_dates
 
     # Verify notification shows P3 as the participant
     assert len(slack.direct_swaps) == 1
-    notified_participant, notified_window = slack.direct_swaps[0]
-    assert notified_participant.email == p3.email
-    assert notified_window.start.date() == dto_to_window(search_window).start.date()
-    assert notified_window.end.date() == dto_to_window(search_window).end.date()
+    notified = slack.direct_swaps[-1]
+    assert notified.participant.email == p3.email
+    assert _dates(notified.window) == search_dates
 
     # Verify no assignments were passed (simple direct swap, not ring closure)
     assert len(slack.last_direct_swap_assignments) == 0
 
-def test_create_offer_rejects_past_let_window():
-    directory = InMemoryParticipantDirectory()
-    repository = InMemoryOfferRepository()
-    slack = DummySlack()
-    schedule_port = FakeSchedulePort(assignments=[])
-    override_port = FakeOverridePort()
-
-    service = SwapNegotiationService(
-        repository=repository,
-        directory=directory,
-        schedule_port=schedule_port,
-        override_port=override_port,
-        slack_notifications=slack,
-        slack_prompts=slack,
-    )
 
-    # Create a window that's in the past relative to TEST_NOW
-    past_start = TEST_NOW.to_datetime() - timedelta(days=1)
-    past_window = TimeWindowDTO(start=past_start, end=past_start + timedelta(hours=12))
+# Twelve hours starting a day before TEST_NOW
+_PAST_WINDOW = TimeWindowDTO(
+    start=TEST_NOW.to_datetime() - _DAY_DELTAS[1],
+    end=TEST_NOW.to_datetime() - _DAY_DELTAS[1] + _TWELVE_HOURS,
+)
+
+
+@pytest.mark.parametrize(
+    "let_window, search_window",
+    [(_PAST_WINDOW, make_window(2)), (make_window(1), _PAST_WINDOW)],
+    ids=["let_in_past", "search_in_past"],
+)
+def test_create_offer_rejects_past_windows(service_factory, let_window, search_window):
+    service = service_factory()
 
     command = CreateOfferCommand(
         requester_email="p1@example.com",
         schedule_id="primary",
-        let_window=past_window,
-        search_windows=[make_window(2)],
+        let_window=let_window,
+        search_windows=[search_window],
     )
 
     with pytest.raises(SwapOffer.TimeWindowInPastError):
         service.create_offer(command, now=TEST_NOW)
 
 
-def test_create_offer_rejects_past_search_window():
-    directory = InMemoryParticipantDirectory()
-    repository = InMemoryOfferRepository()
-    slack = DummySlack()
-    schedule_port = FakeSchedulePort(assignments=[])
-    override_port = FakeOverridePort()
-
-    service = SwapNegotiationService(
-        repository=repository,
-        directory=directory,
-        schedule_port=schedule_port,
-        override_port=override_port,
-        slack_notifications=slack,
-        slack_prompts=slack,
-    )
+def test_direct_swap_flushes_overrides_in_single_call(participants, slack, override_port, service_factory):
+    requester = participants["p1@example.com"]
+    direct_participant = participants["p2@example.com"]
 
-    future_let = make_window(1)
-    # Create a window that's in the past relative to TEST_NOW
-    past_start = TEST_NOW.to_datetime() - timedelta(days=1)
-    past_search = TimeWindowDTO(start=past_start, end=past_start + timedelta(hours=12))
+    let_window = make_window(0)
+    search_window = make_window(4)
 
-    command = CreateOfferCommand(
-        requester_email="p1@example.com",
-        schedule_id="primary",
-        let_window=future_let,
-        search_windows=[past_search],
+    batches: List[List[OnCallAssignment]] = []
+    original_apply_overrides = override_port.apply_overrides
+
+    def recording_apply_overrides(schedule_id, assignments):
+        batches.append(list(assignments))
+        original_apply_overrides(schedule_id, assignments)
+
+    override_port.apply_overrides = recording_apply_overrides
+
+    service = service_factory()
+
+    offer = service.create_offer(
+        CreateOfferCommand(
+            requester_email=requester.email,
+            schedule_id="primary",
+            let_window=let_window,
+            search_windows=[search_window],
+        ),
+        now=TEST_NOW,
     )
+    assert slack.announce_count == 1
+    assert slack.last_announcement.id == offer.id
 
-    with pytest.raises(SwapOffer.TimeWindowInPastError):
-        service.create_offer(command, now=TEST_NOW)
+    service.accept_cover(
+        AcceptCoverCommand(
+            offer_id=offer.id,
+            participant_email=direct_participant.email,
+            covers_window=let_window,
+            needs_windows=[search_window],
+        )
+    )
+
+    assert len(batches) == 1
+    assert {a.participant.email for a in batches[0]} == {requester.email, direct_participant.email}
+    assert len(slack.direct_swaps) == 1
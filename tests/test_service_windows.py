@@ -1,67 +1,62 @@
 from datetime import datetime, timedelta, timezone
-from typing import List
 
-from oncall_swap.application.services import SwapNegotiationService
-from oncall_swap.domain.models import Participant, TimeWindow
-from oncall_swap.infrastructure.directory.in_memory import InMemoryParticipantDirectory
-from oncall_swap.infrastructure.persistence.in_memory import InMemoryOfferRepository
-from oncall_swap.ports.opsgenie import OnCallAssignment, OpsgenieOverridePort, OpsgenieSchedulePort
+import pytest
 
+from _common import OnCallAssignment, Participant, TimeWindow
 
-class FakeSchedulePort(OpsgenieSchedulePort):
-    def __init__(self, assignments: List[OnCallAssignment]) -> None:
-        self.assignments = assignments
+_NOW = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+# p1 on call tomorrow, p2 the day after
+_SHIFTS = [
+    OnCallAssignment(
+        participant=Participant(email=f"p{day}@example.com"),
+        window=TimeWindow(start=_NOW + timedelta(days=day), end=_NOW + timedelta(days=day, hours=12)),
+    )
+    for day in (1, 2)
+]
 
-    def list_oncall(self, schedule_id: str, start: datetime, end: datetime) -> List[OnCallAssignment]:
-        return [
-            assignment
-            for assignment in self.assignments
-            if assignment.window.start >= start and assignment.window.end <= end
-        ]
 
+@pytest.mark.parametrize("schedule_port", [_SHIFTS], indirect=True, ids=["two_shifts"])
+def test_get_upcoming_windows_filters_by_email(schedule_port, service_factory):
+    service = service_factory()
 
-class DummyOverridePort(OpsgenieOverridePort):
-    def apply_override(self, schedule_id: str, participant: Participant, window: TimeWindow) -> None:  # noqa: D401
-        """No-op override port for testing."""
-        return
+    windows = service.get_upcoming_windows(
+        schedule_id="primary",
+        participant_email="p1@example.com",
+        horizon_days=7,
+        now=_NOW,
+    )
 
+    assert len(windows) == 1
+    assert windows[0].start == _SHIFTS[0].window.start
+    assert windows[0].end == _SHIFTS[0].window.end
 
-def test_get_upcoming_windows_filters_by_email():
+
+def test_get_upcoming_windows_uses_indexed_schedule_for_large_rotations(participants, service_factory):
     now = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
-    p1 = Participant(email="p1@example.com")
-    p2 = Participant(email="p2@example.com")
+    rotation = list(participants.values())
 
+    # Two months of daily shifts, listed newest first so the index has to sort them
     assignments = [
         OnCallAssignment(
-            participant=p1,
-            window=TimeWindow(
-                start=now + timedelta(days=1),
-                end=now + timedelta(days=1, hours=12),
-            ),
-        ),
-        OnCallAssignment(
-            participant=p2,
-            window=TimeWindow(
-                start=now + timedelta(days=2),
-                end=now + timedelta(days=2, hours=12),
-            ),
-        ),
+            participant=rotation[day % len(rotation)],
+            window=TimeWindow(start=now + timedelta(days=day), end=now + timedelta(days=day, hours=12)),
+        )
+        for day in reversed(range(-10, 50))
     ]
 
-    service = SwapNegotiationService(
-        repository=InMemoryOfferRepository(),
-        directory=InMemoryParticipantDirectory(),
-        schedule_port=FakeSchedulePort(assignments),
-        override_port=DummyOverridePort(),
-    )
+    service = service_factory(assignments)
 
     windows = service.get_upcoming_windows(
         schedule_id="primary",
         participant_email="p1@example.com",
-        horizon_days=7,
+        horizon_days=14,
         now=now,
     )
 
-    assert len(windows) == 1
-    assert windows[0].start == assignments[0].window.start
-    assert windows[0].end == assignments[0].window.end
+    assert sorted(window.start for window in windows) == [
+        assignment.window.start
+        for assignment in reversed(assignments)
+        if assignment.participant is rotation[0]
+        and now <= assignment.window.start
+        and assignment.window.end <= now + timedelta(days=14)
+    ]
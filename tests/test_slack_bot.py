@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+from _common import Participant, SwapOffer, TimeWindow
+from oncall_swap.adapters.slack import bot as slack_bot
+from oncall_swap.adapters.slack.bot import SlackBotAdapter
+
+
+def _slack_error(error: str, status_code: int = 200) -> SlackApiError:
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/test",
+        req_args={},
+        data={"ok": False, "error": error},
+        headers={},
+        status_code=status_code,
+    )
+    return SlackApiError(error, response)
+
+
+class StubClient:
+    """Records Web API calls; ``failures`` queues errors to raise per method before succeeding."""
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, List[Dict[str, Any]]] = {}
+        self.failures: Dict[str, List[SlackApiError]] = {}
+
+    def _call(self, method: str, **kwargs: Any) -> Dict[str, Any]:
+        self.calls.setdefault(method, []).append(kwargs)
+        if self.failures.get(method):
+            raise self.failures[method].pop(0)
+        return {"ok": True, "channel": kwargs.get("channel"), "ts": "1.0"}
+
+    def users_profile_get(self, **kwargs: Any) -> Dict[str, Any]:
+        return {"profile": {"email": "p1@example.com"}}
+
+    def views_open(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("views_open", **kwargs)
+
+    def chat_postMessage(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("chat_postMessage", **kwargs)
+
+
+class StubApp:
+    """Stands in for a Bolt App: exposes the client and captures registered handlers by id."""
+
+    def __init__(self) -> None:
+        self.client = StubClient()
+        self.handlers: Dict[str, Callable[..., None]] = {}
+
+    def _register(self, key: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+        def decorator(handler: Callable[..., None]) -> Callable[..., None]:
+            self.handlers[key] = handler
+            return handler
+
+        return decorator
+
+    command = action = view = _register
+
+
+_NOW = datetime(2025, 11, 10, 9, tzinfo=timezone.utc)
+_WINDOWS = [TimeWindow(start=_NOW + timedelta(days=day), end=_NOW + timedelta(days=day, hours=12)) for day in (1, 2)]
+
+
+@pytest.fixture
+def app() -> StubApp:
+    return StubApp()
+
+
+@pytest.fixture
+def service() -> MagicMock:
+    service = MagicMock()
+    service.get_upcoming_windows.return_value = _WINDOWS
+    return service
+
+
+@pytest.fixture
+def swap_command(app, service) -> Callable[[], MagicMock]:
+    """Run /swap-oncall once and return the ``respond`` mock it was given."""
+    SlackBotAdapter(app, service, announcement_channel="C-announce", schedule_id="primary")
+
+    def run() -> MagicMock:
+        respond = MagicMock()
+        app.handlers["/swap-oncall"](
+            ack=MagicMock(),
+            body={"user_id": "U1", "channel_id": "C1", "trigger_id": "trigger"},
+            respond=respond,
+            logger=MagicMock(),
+        )
+        return respond
+
+    return run
+
+
+@pytest.mark.parametrize(
+    "error", [_slack_error("internal_error"), _slack_error("", status_code=503)], ids=["internal_error", "http_503"]
+)
+def test_views_open_is_retried_once_on_transient_error(app, swap_command, error):
+    app.client.failures["views_open"] = [error]
+
+    respond = swap_command()
+
+    assert len(app.client.calls["views_open"]) == 2
+    respond.assert_not_called()
+
+
+@pytest.mark.parametrize("error", ["expired_trigger_id", "invalid_auth", "ratelimited"])
+def test_views_open_is_not_retried_on_other_errors(app, swap_command, error):
+    app.client.failures["views_open"] = [_slack_error(error)]
+
+    respond = swap_command()
+
+    assert len(app.client.calls["views_open"]) == 1
+    assert "Failed to start swap offer" in respond.call_args.args[0]
+
+
+def test_cached_windows_stand_in_for_opsgenie_until_they_expire(app, service, swap_command, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(slack_bot, "monotonic", lambda: clock[0])
+    swap_command()
+
+    service.get_upcoming_windows.side_effect = ConnectionError("opsgenie unavailable")
+    clock[0] += slack_bot._WINDOWS_CACHE_TTL_SECONDS - 1
+    respond = swap_command()
+    assert len(app.client.calls["views_open"]) == 2
+    respond.assert_not_called()
+
+    clock[0] += 2
+    respond = swap_command()
+    assert len(app.client.calls["views_open"]) == 2
+    assert "opsgenie unavailable" in respond.call_args.args[0]
+
+
+def test_offer_announcement_is_not_retried(app, service):
+    adapter = SlackBotAdapter(app, service, announcement_channel="C-announce", schedule_id="primary")
+    app.client.failures["chat_postMessage"] = [_slack_error("request_timeout")]
+    offer = SwapOffer(
+        requester=Participant(email="p1@example.com"),
+        schedule_id="primary",
+        let_window=_WINDOWS[0],
+        search_windows=[_WINDOWS[1]],
+    )
+
+    with pytest.raises(SlackApiError):
+        adapter.announce_offer(offer)
+
+    assert len(app.client.calls["chat_postMessage"]) == 1
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from oncall_swap.domain.models import Participant, SwapOffer, TimeWindow, WindowNeed
+
+
+def _window(start: datetime, hours: int = 12) -> TimeWindow:
+    return TimeWindow(start=start, end=start + timedelta(hours=hours))
+
+
+def _offer(requester: Participant) -> SwapOffer:
+    return SwapOffer(
+        requester=requester,
+        schedule_id="primary",
+        let_window=_window(datetime(2025, 11, 10, 9, tzinfo=timezone.utc)),
+        search_windows=[_window(datetime(2025, 11, 14, 9, tzinfo=timezone.utc))],
+    )
+
+
+def test_commitment_index_follows_additions_and_reassignment():
+    requester = Participant(email="p1@example.com")
+    coverer = Participant(email="p2@example.com")
+    offer = _offer(requester)
+    let_need = offer.outstanding_needs[0]
+
+    assert offer.commitments_overlapping(offer.let_window) == []
+
+    commitment = offer.add_commitment(coverer, let_need)
+    assert offer.commitments_overlapping(offer.let_window) == [commitment]
+    assert offer.commitments_on(offer.let_window.start.date()) == [commitment]
+
+    offer.partial_commitments = []
+    assert offer.commitments_overlapping(offer.let_window) == []
+
+
+def test_commitment_lookup_matches_multi_day_windows_by_date_overlap():
+    requester = Participant(email="p1@example.com")
+    coverer = Participant(email="p2@example.com")
+    offer = _offer(requester)
+    overnight = _window(datetime(2025, 11, 10, 21, tzinfo=timezone.utc), hours=24)
+
+    commitment = offer.add_commitment(coverer, WindowNeed(owner=requester, window=overnight))
+
+    assert offer.commitments_on(overnight.end.date()) == [commitment]
+    assert offer.commitments_overlapping(_window(datetime(2025, 11, 11, 9, tzinfo=timezone.utc))) == [commitment]
+
+
+def test_needs_index_follows_additions_and_reassignment():
+    requester = Participant(email="p1@example.com")
+    owner = Participant(email="p3@example.com")
+    offer = _offer(requester)
+
+    assert [n.created_by_offer for n in offer.needs_owned_by(requester.id)] == [True]
+
+    need = offer.add_need(WindowNeed(owner=owner, window=_window(datetime(2025, 11, 20, 9, tzinfo=timezone.utc))))
+    assert offer.needs_owned_by(owner.id) == [need]
+
+    offer.outstanding_needs = []
+    assert offer.needs_owned_by(owner.id) == []
+    assert offer.needs_owned_by(requester.id) == []
+
+
+def test_resolve_need_removes_every_need_sharing_a_date():
+    requester = Participant(email="p1@example.com")
+    owner = Participant(email="p3@example.com")
+    offer = _offer(requester)
+    overnight = offer.add_need(
+        WindowNeed(owner=owner, window=_window(datetime(2025, 11, 19, 21, tzinfo=timezone.utc), hours=24))
+    )
+    later = offer.add_need(WindowNeed(owner=owner, window=_window(datetime(2025, 11, 20, 9, tzinfo=timezone.utc))))
+
+    covering = _window(datetime(2025, 11, 20, 0, tzinfo=timezone.utc), hours=23)
+    assert offer.find_need(covering) is overnight
+    assert offer.has_need_starting_on(later.window.start_date)
+
+    assert offer.resolve_need(covering) is overnight
+    assert offer.find_need(covering) is None
+    assert [n.created_by_offer for n in offer.outstanding_needs] == [True]
+
+
+def test_cached_window_fields_cannot_go_stale():
+    window = _window(datetime(2025, 11, 10, 9, tzinfo=timezone.utc))
+    assert window.start_date.day == 10 and window.bounds[0].day == 10
+
+    with pytest.raises(ValidationError):
+        window.start = datetime(2025, 11, 9, 9, tzinfo=timezone.utc)
+
+    moved = window.model_copy(update={"start": datetime(2025, 11, 9, 9, tzinfo=timezone.utc)})
+    assert moved.start_date.day == 9 and moved.bounds[0].day == 9
+    assert window.start_date.day == 10
+
+    participant = Participant(email="P1@example.com")
+    assert participant.email_lower == "p1@example.com"
+    assert participant.model_copy(update={"email": "P2@example.com"}).email_lower == "p2@example.com"
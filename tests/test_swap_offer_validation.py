@@ -1,85 +1,58 @@
+from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from oncall_swap.domain.models import Participant, SwapOffer, TimeWindow
-from oncall_swap.domain.time import Instant
+from _common import Instant, Participant, SwapOffer, TimeWindow
 
 
-def _window(start: datetime, hours: int = 8) -> TimeWindow:
-    return TimeWindow(start=start, end=start + timedelta(hours=hours))
-
+_HOUR_DELTAS = {hours: timedelta(hours=hours) for hours in (8, 12)}
 
-def test_rejects_let_window_in_past():
-    now = Instant(at=datetime(2025, 1, 10, tzinfo=timezone.utc))
-    past_start = datetime(2025, 1, 9, 8, tzinfo=timezone.utc)
 
-    with pytest.raises(SwapOffer.TimeWindowInPastError):
-        SwapOffer.create(
-            requester=Participant(email="p1@example.com"),
-            schedule_id="primary",
-            let_window=_window(past_start),
-            search_windows=[_window(past_start + timedelta(days=2))],
-            now=now,
-        )
+def _window(start: datetime, hours: int = 8) -> TimeWindow:
+    return TimeWindow(start=start, end=start + _HOUR_DELTAS[hours])
 
 
-def test_rejects_search_window_in_past():
-    now = Instant(at=datetime(2025, 1, 10, tzinfo=timezone.utc))
-    future_start = datetime(2025, 1, 12, 8, tzinfo=timezone.utc)
-    past_search = datetime(2025, 1, 9, 8, tzinfo=timezone.utc)
+@pytest.fixture(scope="module")
+def now() -> Instant:
+    return Instant(at=datetime(2025, 1, 10, tzinfo=timezone.utc))
 
-    with pytest.raises(SwapOffer.TimeWindowInPastError):
-        SwapOffer.create(
-            requester=Participant(email="p1@example.com"),
-            schedule_id="primary",
-            let_window=_window(future_start),
-            search_windows=[_window(past_search)],
-            now=now,
-        )
 
+@pytest.fixture(scope="module")
+def requester() -> Participant:
+    return Participant(email="p1@example.com")
 
-def test_allows_future_windows_relative_to_instant():
-    now = Instant(at=datetime(2025, 1, 10, tzinfo=timezone.utc))
-    let_start = datetime(2025, 1, 11, 8, tzinfo=timezone.utc)
-    search_start = datetime(2025, 1, 13, 8, tzinfo=timezone.utc)
 
-    offer = SwapOffer.create(
-        requester=Participant(email="p1@example.com"),
-        schedule_id="primary",
-        let_window=_window(let_start),
-        search_windows=[_window(search_start)],
-        now=now,
-    )
+_PAST = datetime(2025, 1, 9, 8, tzinfo=timezone.utc)
+_FUTURE_LET = datetime(2025, 1, 11, 8, tzinfo=timezone.utc)
+_FUTURE_SEARCH = datetime(2025, 1, 13, 8, tzinfo=timezone.utc)
 
-    assert offer.let_window.start == let_start
+# (case id, let window start, search window start, should raise); naive starts are read as UTC
+PAST_CASES = [
+    ("let_in_past", _PAST, _PAST + timedelta(days=2), True),
+    ("search_in_past", _FUTURE_LET, _PAST, True),
+    ("naive_past_let", _PAST.replace(tzinfo=None), _PAST.replace(tzinfo=None) + timedelta(days=2), True),
+    ("all_future", _FUTURE_LET, _FUTURE_SEARCH, False),
+    ("naive_all_future", _FUTURE_LET.replace(tzinfo=None), _FUTURE_SEARCH.replace(tzinfo=None), False),
+]
 
 
-def test_rejects_naive_let_window_in_past():
-    now = Instant(at=datetime(2025, 1, 10, tzinfo=timezone.utc))
-    past_start = datetime(2025, 1, 9, 8)  # naive datetime
+@pytest.mark.parametrize(
+    "let_start, search_start, should_raise",
+    [case[1:] for case in PAST_CASES],
+    ids=[case[0] for case in PAST_CASES],
+)
+def test_past_window_validation(now, requester, let_start, search_start, should_raise):
+    expectation = pytest.raises(SwapOffer.TimeWindowInPastError) if should_raise else nullcontext()
 
-    with pytest.raises(SwapOffer.TimeWindowInPastError):
-        SwapOffer.create(
-            requester=Participant(email="p1@example.com"),
+    with expectation:
+        offer = SwapOffer.create(
+            requester=requester,
             schedule_id="primary",
-            let_window=_window(past_start),
-            search_windows=[_window(past_start + timedelta(days=2))],
+            let_window=_window(let_start),
+            search_windows=[_window(search_start)],
             now=now,
         )
 
-
-def test_accepts_naive_future_windows_with_injected_now():
-    now = Instant(at=datetime(2025, 1, 10, tzinfo=timezone.utc))
-    let_start = datetime(2025, 1, 11, 8)  # naive
-    search_start = datetime(2025, 1, 12, 8)  # naive
-
-    offer = SwapOffer.create(
-        requester=Participant(email="p1@example.com"),
-        schedule_id="primary",
-        let_window=_window(let_start),
-        search_windows=[_window(search_start)],
-        now=now,
-    )
-
-    assert offer.let_window.start == let_start
+    if not should_raise:
+        assert offer.let_window.start == let_start